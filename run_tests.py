@@ -10,11 +10,14 @@ e funcionalidades do projeto.
 Uso:
     python run_tests.py
     python run_tests.py --quick  # Apenas testes rápidos
+    python run_tests.py -j 4     # Testes independentes em paralelo
 """
 
 import sys
 import os
 import argparse
+import subprocess
+from multiprocessing import Pool, cpu_count
 
 # Adicionar diretório raiz ao path
 PROJECT_ROOT = os.path.abspath(os.path.dirname(__file__))
@@ -45,7 +48,6 @@ def run_test(test_file, description):
     
     try:
         # Executar teste como subprocesso
-        import subprocess
         result = subprocess.run(
             [sys.executable, test_path],
             cwd=PROJECT_ROOT,
@@ -58,12 +60,87 @@ def run_test(test_file, description):
         return False
 
 
+def _run_test_captured(args):
+    """
+    Executa um arquivo de teste capturando a saída (usado pelo modo paralelo).
+    
+    Cada teste roda em seu próprio processo Python; as variáveis de threads
+    (OpenMP/BLAS) são limitadas para que testes simultâneos não disputem
+    os mesmos núcleos.
+    
+    Args:
+        args: Tupla (test_name, test_file, description, n_threads)
+    
+    Returns:
+        tuple: (test_name, description, resultado, saída)
+    """
+    test_name, test_file, description, n_threads = args
+    test_path = os.path.join(PROJECT_ROOT, 'tests', test_file)
+    
+    if not os.path.exists(test_path):
+        return test_name, description, None, f"⚠️  Teste não encontrado: {test_file}\n"
+    
+    env = os.environ.copy()
+    for var in ('OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS'):
+        env[var] = str(n_threads)
+    
+    try:
+        result = subprocess.run(
+            [sys.executable, test_path],
+            cwd=PROJECT_ROOT,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True
+        )
+        return test_name, description, result.returncode == 0, result.stdout
+    except Exception as e:
+        return test_name, description, False, f"❌ Erro ao executar teste: {e}\n"
+
+
+def run_tests_parallel(tests_to_run, n_jobs):
+    """
+    Executa testes independentes em paralelo, um processo por teste.
+    
+    A saída de cada teste é capturada e exibida em bloco ao final,
+    na ordem original, para não intercalar as mensagens.
+    
+    Args:
+        tests_to_run: Dicionário {nome: info} dos testes
+        n_jobs: Número de testes simultâneos
+    
+    Returns:
+        dict: {nome: resultado}
+    """
+    n_threads = max(1, cpu_count() // n_jobs)
+    jobs = [(name, info['file'], info['description'], n_threads)
+            for name, info in tests_to_run.items()]
+    
+    print(f"\nExecutando {len(jobs)} testes em paralelo ({n_jobs} processos, "
+          f"{n_threads} thread(s) cada)...")
+    
+    with Pool(processes=n_jobs) as pool:
+        outputs = pool.map(_run_test_captured, jobs)
+    
+    results = {}
+    for test_name, description, result, output in outputs:
+        print(f"\n{'='*70}")
+        print(f" {description}")
+        print(f"{'='*70}\n")
+        print(output, end='')
+        results[test_name] = result
+    
+    return results
+
+
 def main():
     parser = argparse.ArgumentParser(description='Executar testes do RecOM')
     parser.add_argument('--quick', action='store_true', 
                        help='Executar apenas testes rápidos (sem geração de grade)')
     parser.add_argument('--test', type=str, 
                        help='Executar apenas um teste específico')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Número de testes executados em paralelo (padrão: 1)')
     args = parser.parse_args()
     
     print("\n" + "="*70)
@@ -91,6 +168,16 @@ def main():
             'file': 'test_interpolation.py',
             'description': 'Teste de Interpolação IDW',
             'quick': True
+        },
+        'grid_io': {
+            'file': 'test_grid_io.py',
+            'description': 'Teste de Leitura de Grades ASCII',
+            'quick': True
+        },
+        'reanalysis_mask': {
+            'file': 'test_reanalysis_mask.py',
+            'description': 'Testes do Extrator de Máscaras de Reanálises',
+            'quick': True
         }
     }
     
@@ -107,10 +194,14 @@ def main():
         tests_to_run = tests
     
     # Executar testes
-    results = {}
-    for test_name, test_info in tests_to_run.items():
-        result = run_test(test_info['file'], test_info['description'])
-        results[test_name] = result
+    n_jobs = max(1, min(args.jobs, len(tests_to_run), cpu_count()))
+    if n_jobs > 1:
+        results = run_tests_parallel(tests_to_run, n_jobs)
+    else:
+        results = {}
+        for test_name, test_info in tests_to_run.items():
+            result = run_test(test_info['file'], test_info['description'])
+            results[test_name] = result
     
     # Resumo
     print("\n" + "="*70)
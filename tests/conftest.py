@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures compartilhadas para execução dos testes via pytest.
+
+Os arquivos de teste continuam executáveis como scripts
+(python tests/test_*.py); este arquivo só é carregado pelo pytest.
+"""
+
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def fake_reanalysis_file():
+    """Arquivo NetCDF sintético de reanálise, criado uma vez por sessão."""
+    from test_reanalysis_mask import create_fake_reanalysis_file
+    
+    path = create_fake_reanalysis_file()
+    yield path
+    
+    if path and os.path.exists(path):
+        os.unlink(path)
+
+
+@pytest.fixture(scope="session")
+def loaded_extractor(fake_reanalysis_file):
+    """Extrator com dados carregados e máscara extraída, compartilhado."""
+    from test_reanalysis_mask import create_loaded_extractor
+    
+    extractor = create_loaded_extractor(fake_reanalysis_file)
+    yield extractor
+    
+    if extractor is not None:
+        extractor.cleanup()
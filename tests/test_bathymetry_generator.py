@@ -13,13 +13,18 @@ Uso:
 
 import sys
 import os
+import shutil
+import tempfile
+from contextlib import contextmanager
 
 # Determinar o diretório raiz do projeto (assumindo que tests/ está no root)
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 
-# Adicionar o projeto root ao PYTHONPATH para garantir imports
-if PROJECT_ROOT not in sys.path:
-    sys.path.insert(0, PROJECT_ROOT)
+# Adicionar o projeto root e o src do gerador ao PYTHONPATH uma única vez
+# (evita inserir o mesmo caminho a cada chamada de teste)
+for _path in (PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'tools', 'gebco_interpolation', 'src')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
 
 
 def test_imports():
@@ -113,7 +118,6 @@ def test_generator_class():
     
     try:
         # Tentar importar da nova estrutura
-        sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools', 'gebco_interpolation', 'src'))
         from bathymetry_generator import BathymetryGridGenerator
         print("\n✓ Classe BathymetryGridGenerator importada com sucesso (nova estrutura)")
         
@@ -155,7 +159,6 @@ def test_small_grid():
     
     try:
         # Importar da nova estrutura
-        sys.path.insert(0, os.path.join(PROJECT_ROOT, 'tools', 'gebco_interpolation', 'src'))
         from bathymetry_generator import BathymetryGridGenerator
         import numpy as np
         
@@ -220,6 +223,283 @@ def test_small_grid():
         return False
 
 
+@contextmanager
+def fake_gebco_file():
+    """
+    Arquivo NetCDF sintético no formato do GEBCO (lat, lon, elevation),
+    criado em um diretório temporário.
+    
+    Arquivos gravados pelo teste no mesmo diretório (grades exportadas etc.)
+    são removidos junto com ele ao final do bloco with.
+    
+    Yields:
+        str: Caminho do arquivo GEBCO sintético
+    """
+    import numpy as np
+    import xarray as xr
+    
+    lons = np.arange(-50.0, -39.95, 0.1)
+    lats = np.arange(-30.0, -19.95, 0.1)
+    # Relevo irregular (aleatório): diferenças entre splines locais e
+    # globais aparecem, ao contrário de um campo suave
+    rng = np.random.default_rng(0)
+    elevation = rng.integers(-5000, 1000, (len(lats), len(lons))).astype(np.int16)
+    
+    ds = xr.Dataset(
+        {'elevation': (['lat', 'lon'], elevation)},
+        coords={'lat': lats, 'lon': lons}
+    )
+    tmpdir = tempfile.mkdtemp()
+    try:
+        path = os.path.join(tmpdir, 'gebco_fake.nc')
+        ds.to_netcdf(path)
+        yield path
+    finally:
+        shutil.rmtree(tmpdir)
+
+
+def make_generator(gebco_file, spacing=0.25, load=True):
+    """
+    Gerador sobre o GEBCO sintético, com a extensão de teste já definida.
+    
+    Parameters:
+        gebco_file (str): Arquivo criado por fake_gebco_file()
+        spacing (float): Espaçamento da grade em graus
+        load (bool): Se True, também carrega os dados do GEBCO
+    
+    Returns:
+        BathymetryGridGenerator: Gerador pronto para interpolar
+    """
+    from bathymetry_generator import BathymetryGridGenerator
+    
+    generator = BathymetryGridGenerator(gebco_file, spacing=spacing)
+    if load:
+        assert generator.load_gebco_data()
+    generator.define_grid_extent(-48.0, -42.0, -28.0, -22.0)
+    return generator
+
+
+def test_parallel_matches_serial():
+    """
+    Testa se a interpolação paralela (em tiles) reproduz a serial.
+    
+    Returns:
+        bool: True se os resultados coincidem para todos os métodos
+    """
+    print("\n" + "="*70)
+    print(" TESTE: Interpolação Paralela x Serial")
+    print("="*70)
+    
+    import numpy as np
+    
+    with fake_gebco_file() as gebco_file:
+        generator = make_generator(gebco_file, spacing=0.07)
+        # Forçar o caminho paralelo mesmo em máquinas com 1 CPU (n_workers é
+        # limitado a cpu_count()) e tiles pequenos: vários tiles na grade de teste
+        generator.n_workers = 2
+        generator.TILE_SIZE = 16
+        
+        for method in ('slinear', 'pchip', 'quintic'):
+            assert generator.interpolate_bathymetry(method=method, parallel=False)
+            serial = generator.depth_grid.copy()
+            assert generator.interpolate_bathymetry(method=method, parallel=True)
+            parallel = generator.depth_grid
+            
+            np.testing.assert_allclose(parallel, serial, rtol=1e-5, atol=1e-2,
+                                       err_msg=f"método {method}")
+            print(f"✓ {method}: paralelo igual ao serial")
+        
+        generator.cleanup()
+    
+    return True
+
+
+def separable_test_cases():
+    """
+    Casos de comparação dos interpoladores separáveis com o
+    RegularGridInterpolator.
+    
+    Alvos fora do domínio, exatamente sobre os nós e nos pontos médios
+    entre nós (coordenadas exatas em ponto flutuante), além de um eixo de
+    longitude com wrap-around na linha de data como o montado em
+    interpolate_bathymetry (0-360 contínuo, com bordas em ±360°).
+    
+    Returns:
+        list: Tuplas (nome, src_lats, src_lons, elevation, lats, lons)
+    """
+    import numpy as np
+    
+    rng = np.random.default_rng(1)
+    
+    def targets(src, step):
+        nodes = src[::3]
+        midpoints = (src[:-1:4] + src[1::4]) / 2
+        inner = rng.uniform(src[0], src[-1], 20)
+        outside = [src[0] - step, src[-1] + step]
+        return np.unique(np.concatenate([nodes, midpoints, inner, outside]))
+    
+    src_lats = np.arange(-30.0, -19.9, 0.5)
+    src_lons = np.arange(-50.0, -39.9, 0.25)
+    
+    # Linha de data: longitudes do GEBCO em 0-360 com uma borda de cada lado
+    dateline = np.arange(170.0, 190.1, 0.25)
+    wrapped_lons = np.concatenate([dateline[:1] - 360, dateline, dateline[-1:] + 360])
+    
+    cases = []
+    for name, lons_src, lons_tgt in (
+            ('regional', src_lons, targets(src_lons, 0.25)),
+            ('linha de data', wrapped_lons,
+             np.unique(np.concatenate([targets(dateline, 0.25), [-189.5, 191.0]])))):
+        elevation = rng.integers(-5000, 1000, (len(src_lats), len(lons_src))).astype(np.float32)
+        cases.append((name, src_lats, lons_src, elevation, targets(src_lats, 0.5), lons_tgt))
+    
+    return cases
+
+
+def compare_with_rgi(method, interpolate, atol):
+    """
+    Compara um interpolador separável do gerador com o
+    RegularGridInterpolator (bounds_error=False, fill_value=0).
+    
+    Parameters:
+        method (str): Método do RegularGridInterpolator
+        interpolate: Função (generator, src_lats, src_lons, elevation, lons)
+        atol (float): Diferença absoluta máxima aceita (m)
+    """
+    import numpy as np
+    from scipy.interpolate import RegularGridInterpolator
+    
+    with fake_gebco_file() as gebco_file:
+        generator = make_generator(gebco_file, load=False)
+        
+        for name, src_lats, src_lons, elevation, lats, lons in separable_test_cases():
+            generator.grid_lats = lats
+            result = interpolate(generator, src_lats, src_lons, elevation, lons)
+            expected = RegularGridInterpolator(
+                (src_lats, src_lons), elevation, method=method,
+                bounds_error=False, fill_value=0
+            )((lats[:, np.newaxis], lons[np.newaxis, :]))
+            
+            np.testing.assert_allclose(result, expected, rtol=0, atol=atol,
+                                       err_msg=f"{method}, caso {name}")
+            print(f"✓ {method} ({name}): igual ao RegularGridInterpolator")
+
+
+def test_linear_matches_rgi():
+    """
+    Testa a interpolação bilinear separável contra o
+    RegularGridInterpolator(method='linear').
+    
+    Returns:
+        bool: True se os resultados coincidem (até arredondamento float32)
+    """
+    print("\n" + "="*70)
+    print(" TESTE: Bilinear Separável x RegularGridInterpolator")
+    print("="*70)
+    
+    # Elevações até ~5000 m combinadas em float32: ~1e-3 m de arredondamento
+    compare_with_rgi('linear', lambda gen, *args: gen._interpolate_linear_separable(*args),
+                     atol=1e-2)
+    return True
+
+
+def test_nearest_matches_rgi():
+    """
+    Testa o vizinho mais próximo por eixo contra o
+    RegularGridInterpolator(method='nearest'), inclusive nos pontos médios
+    exatos entre nós (empate: o menor índice).
+    
+    Returns:
+        bool: True se os resultados são idênticos
+    """
+    print("\n" + "="*70)
+    print(" TESTE: Vizinho Mais Próximo x RegularGridInterpolator")
+    print("="*70)
+    
+    compare_with_rgi('nearest', lambda gen, *args: gen._interpolate_nearest_separable(*args),
+                     atol=0)
+    return True
+
+
+def test_netcdf_reuse():
+    """
+    Testa o reaproveitamento da grade salva em NetCDF e sua invalidação
+    quando a configuração ou o arquivo GEBCO mudam.
+    
+    Returns:
+        bool: True se a grade é reaproveitada só com a mesma configuração
+    """
+    print("\n" + "="*70)
+    print(" TESTE: Reaproveitamento da Grade NetCDF")
+    print("="*70)
+    
+    import numpy as np
+    
+    with fake_gebco_file() as gebco_file:
+        nc_file = os.path.join(os.path.dirname(gebco_file), 'grid.nc')
+        
+        generator = make_generator(gebco_file)
+        assert generator.interpolate_bathymetry(method='linear')
+        assert generator.export_to_netcdf(nc_file)
+        generator.cleanup()
+        
+        # Mesma configuração: grade reaproveitada, sem interpolar
+        reused = make_generator(gebco_file, load=False)
+        assert reused.load_from_netcdf(nc_file, method='linear'), "Grade não reaproveitada"
+        np.testing.assert_array_equal(reused.depth_grid, generator.depth_grid)
+        print("✓ Mesma configuração: grade reaproveitada")
+        
+        # Outro método ou espaçamento: grade regenerada
+        assert not make_generator(gebco_file, load=False).load_from_netcdf(nc_file, method='nearest')
+        assert not make_generator(gebco_file, spacing=0.5, load=False).load_from_netcdf(nc_file, method='linear')
+        print("✓ Método/espaçamento diferentes: grade não reaproveitada")
+        
+        # Arquivo GEBCO modificado após a geração: grade regenerada
+        mtime = os.path.getmtime(gebco_file)
+        os.utime(gebco_file, (mtime + 10, mtime + 10))
+        assert not make_generator(gebco_file, load=False).load_from_netcdf(nc_file, method='linear')
+        print("✓ GEBCO modificado: grade não reaproveitada")
+    
+    return True
+
+
+def test_gzip_export():
+    """
+    Testa a exportação ASCII comprimida (.gz).
+    
+    Returns:
+        bool: True se o arquivo .gz tem o mesmo conteúdo do ASCII
+    """
+    print("\n" + "="*70)
+    print(" TESTE: Exportação ASCII Comprimida (.gz)")
+    print("="*70)
+    
+    import gzip
+    
+    with fake_gebco_file() as gebco_file:
+        asc_file = os.path.join(os.path.dirname(gebco_file), 'grid.asc')
+        gz_file = asc_file + '.gz'
+        
+        generator = make_generator(gebco_file)
+        assert generator.interpolate_bathymetry(method='linear')
+        assert generator.export_to_ascii(asc_file)
+        assert generator.export_to_ascii(gz_file)
+        generator.cleanup()
+        
+        # Dados idênticos (o cabeçalho tem a data/hora da gravação)
+        with open(asc_file) as f:
+            plain = [line for line in f if not line.startswith('#')]
+        with gzip.open(gz_file, 'rt') as f:
+            compressed = [line for line in f if not line.startswith('#')]
+        
+        assert len(plain) == generator.depth_grid.size
+        assert compressed == plain, "Conteúdo do .gz difere do ASCII"
+        assert os.path.getsize(gz_file) < os.path.getsize(asc_file)
+        print("✓ Arquivo .gz com os mesmos dados do ASCII")
+    
+    return True
+
+
 def main():
     """
     Executa todos os testes.
@@ -235,6 +515,11 @@ def main():
     results['imports'] = test_imports()
     results['gebco_file'] = test_gebco_file()
     results['generator_class'] = test_generator_class()
+    results['parallel'] = test_parallel_matches_serial() if results['imports'] else None
+    results['linear'] = test_linear_matches_rgi() if results['imports'] else None
+    results['nearest'] = test_nearest_matches_rgi() if results['imports'] else None
+    results['netcdf_reuse'] = test_netcdf_reuse() if results['imports'] else None
+    results['gzip_export'] = test_gzip_export() if results['imports'] else None
     
     # Teste de geração apenas se os anteriores passaram
     if results['imports'] and results['gebco_file']:
@@ -255,6 +540,11 @@ def main():
         'imports': 'Dependências',
         'gebco_file': 'Arquivo GEBCO',
         'generator_class': 'Classe Geradora',
+        'parallel': 'Paralelo x Serial',
+        'linear': 'Bilinear x scipy',
+        'nearest': 'Vizinho próximo x scipy',
+        'netcdf_reuse': 'Reaproveitamento NetCDF',
+        'gzip_export': 'Exportação .gz',
         'small_grid': 'Geração de Grade'
     }
     
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Testes de Leitura de Grades ASCII
+=================================
+
+Verifica que o visualizador/editor carregam grades gravadas pelas demais
+ferramentas (ex: apply_mask, que numera os índices a partir de 0).
+"""
+
+import sys
+import os
+import tempfile
+import numpy as np
+
+# Backend não-interativo
+import matplotlib
+matplotlib.use('Agg')
+
+# Adicionar diretórios das ferramentas ao path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for _path in (os.path.join(project_root, 'tools', 'grid_editor', 'src'),
+              os.path.join(project_root, 'tools', 'grid_editor', 'scripts'),
+              os.path.join(project_root, 'tools', 'reanalysis_mask', 'scripts')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+import apply_mask
+from visualize_grid import load_grid
+from grid_utils import axis_from_indices
+
+
+def test_load_apply_mask_grid():
+    """
+    Testa carregamento de grade 5 x 3 gravada por apply_mask.save_grid
+    """
+    print("="*70)
+    print(" TESTE: Leitura de grade gravada pelo apply_mask")
+    print("="*70)
+
+    lons = np.linspace(-50.0, -48.0, 5)
+    lats = np.linspace(-30.0, -29.0, 3)
+    depth = np.arange(15, dtype=np.float32).reshape(3, 5) * 10.0
+
+    fd, path = tempfile.mkstemp(suffix='.asc')
+    os.close(fd)
+    try:
+        apply_mask.save_grid(path, ['# Grade de teste'], lons, lats, depth, 'mask.asc')
+
+        lons_r, lats_r, depth_r, header = load_grid(path)
+
+        assert depth_r.shape == (3, 5), f"forma {depth_r.shape}"
+        np.testing.assert_allclose(lons_r, lons)
+        np.testing.assert_allclose(lats_r, lats)
+        np.testing.assert_allclose(depth_r, depth)
+        assert header[0] == '# Grade de teste'
+        print("✓ Grade carregada com forma e valores originais")
+    finally:
+        os.unlink(path)
+
+    return True
+
+
+def test_axis_from_indices():
+    """
+    Testa reconstrução dos eixos com índices a partir de 1, de 0 e com lacunas
+    """
+    print("="*70)
+    print(" TESTE: Eixos a partir dos índices")
+    print("="*70)
+
+    coords = np.array([10.0, 11.0, 12.0, 10.0, 11.0, 12.0])
+
+    for start in (0, 1):
+        indices = np.array([0, 1, 2, 0, 1, 2]) + start
+        axis, pos = axis_from_indices(indices, coords)
+        np.testing.assert_allclose(axis, [10.0, 11.0, 12.0])
+        np.testing.assert_array_equal(axis[pos], coords)
+        print(f"✓ Índices a partir de {start}")
+
+    # Lacuna nos índices (i = 2 ausente): eixo pelos valores únicos
+    indices = np.array([1, 3, 4, 1, 3, 4])
+    axis, pos = axis_from_indices(indices, coords)
+    np.testing.assert_allclose(axis, [10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(axis[pos], coords)
+    print("✓ Índices com lacunas")
+
+    return True
+
+
+def main():
+    """
+    Executa todos os testes
+    """
+    results = [
+        test_load_apply_mask_grid(),
+        test_axis_from_indices(),
+    ]
+
+    print("\n" + "="*70)
+    if all(results):
+        print("✓ TODOS OS TESTES PASSARAM")
+        return 0
+    print("✗ ALGUNS TESTES FALHARAM")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
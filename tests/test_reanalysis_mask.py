@@ -9,14 +9,24 @@ Testes automatizados para o módulo reanalysis_mask.
 
 import sys
 import os
+import io
 import numpy as np
 import tempfile
+from functools import lru_cache
 
-# Adicionar diretório src ao path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'reanalysis_mask', 'src'))
+# Adicionar diretórios src e scripts ao path uma única vez
+_TOOL_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'tools', 'reanalysis_mask'))
+for _path in (os.path.join(_TOOL_DIR, 'src'), os.path.join(_TOOL_DIR, 'scripts')):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
 
 from mask_extractor import ReanalysisMaskExtractor
 
+# Diretório em memória (tmpfs) para arquivos temporários, se disponível.
+# O extrator trabalha com caminhos de arquivo, então o NetCDF sintético
+# continua sendo um arquivo, mas sem passar pelo disco.
+MEMORY_TMPDIR = '/dev/shm' if os.access('/dev/shm', os.W_OK) else None
+
 
 def create_fake_reanalysis_file():
     """Cria arquivo NetCDF fake para testes."""
@@ -27,11 +37,11 @@ def create_fake_reanalysis_file():
         lons = np.arange(-60, -30, 0.1)
         lats = np.arange(-35, -5, 0.1)
         
-        lon_mesh, lat_mesh = np.meshgrid(lons, lats)
-        
         # Criar dados com máscara (oceano/terra)
         # Simples: oceano onde lon < -45, terra onde lon >= -45
-        data = np.where(lon_mesh < -45, 10.0, np.nan)
+        # A máscara só depende da longitude: montar uma linha e repeti-la
+        ocean_row = np.where(lons < -45, 10.0, np.nan).astype(np.float32)
+        data = np.tile(ocean_row, (len(lats), 1))
         
         # Criar dataset
         ds = xr.Dataset({
@@ -43,8 +53,10 @@ def create_fake_reanalysis_file():
         })
         
         # Salvar
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.nc')
-        ds.to_netcdf(temp_file.name)
+        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.nc', dir=MEMORY_TMPDIR)
+        # Sem compressão e com layout contíguo (fixture pequena, escrita única)
+        ds.to_netcdf(temp_file.name,
+                     encoding={'eta_t': {'zlib': False, 'contiguous': True}})
         temp_file.close()
         
         return temp_file.name
@@ -53,12 +65,50 @@ def create_fake_reanalysis_file():
         return None
 
 
-def test_mask_extraction():
+def create_loaded_extractor(fake_file):
+    """Cria extrator com dados carregados e máscara já extraída."""
+    if fake_file is None:
+        return None
+    
+    extractor = ReanalysisMaskExtractor(fake_file, 'eta_t')
+    extractor.load_data()
+    extractor.extract_mask()
+    
+    return extractor
+
+
+@lru_cache(maxsize=1)
+def create_boundary_test_data():
+    """
+    Cria grade global e máscara sintéticas (determinísticas) para o teste de bordas.
+    
+    Os arrays são compartilhados entre chamadas e não devem ser modificados
+    (apply_mask trabalha sobre cópias).
+    
+    Returns:
+        tuple: (lons_grid, lats_grid, depth_grid, lons_mask, lats_mask, mask)
+    """
+    # Grade sintética global (-180 a +180)
+    # O teste só verifica a cobertura em longitude: profundidade constante
+    lons_grid = np.arange(-180, 180.1, 0.3)
+    lats_grid = np.arange(-75, 75.1, 0.25)
+    depth_grid = np.full((len(lats_grid), len(lons_grid)), 1000.0, dtype=np.float32)
+    
+    # Máscara sintética (formato 0-360, menor domínio), com semente fixa
+    lons_mask = np.arange(0.05, 360.0, 0.3)
+    lats_mask = np.arange(-74.95, 75.0, 0.25)
+    rng = np.random.default_rng(0)
+    mask = rng.integers(0, 2, (len(lats_mask), len(lons_mask)), dtype=np.uint8)
+    
+    return lons_grid, lats_grid, depth_grid, lons_mask, lats_mask, mask
+
+
+def test_mask_extraction(fake_reanalysis_file):
     """Testa extração de máscara."""
     print("\nTeste 1: Extração de Máscara")
     print("-" * 50)
     
-    fake_file = create_fake_reanalysis_file()
+    fake_file = fake_reanalysis_file
     
     if fake_file is None:
         print("⚠ xarray não disponível, pulando teste")
@@ -80,41 +130,34 @@ def test_mask_extraction():
         
         # Verificar valores (0 ou 1)
         unique_vals = np.unique(extractor.mask)
-        assert np.all(np.isin(unique_vals, [0, 1])), "Máscara deve conter apenas 0 e 1"
+        assert np.all((unique_vals == 0) | (unique_vals == 1)), "Máscara deve conter apenas 0 e 1"
         
         # Verificar que há oceano e terra
         assert np.sum(extractor.mask == 1) > 0, "Deve haver pontos oceânicos"
         assert np.sum(extractor.mask == 0) > 0, "Deve haver pontos terrestres"
         
         extractor.cleanup()
-        os.unlink(fake_file)
         
         print("✓ Teste passou!")
         return True
         
     except Exception as e:
         print(f"✗ Teste falhou: {e}")
-        if fake_file and os.path.exists(fake_file):
-            os.unlink(fake_file)
         return False
 
 
-def test_mask_coarsening():
+def test_mask_coarsening(loaded_extractor):
     """Testa degradação de resolução."""
     print("\nTeste 2: Degradação de Resolução")
     print("-" * 50)
     
-    fake_file = create_fake_reanalysis_file()
+    extractor = loaded_extractor
     
-    if fake_file is None:
+    if extractor is None:
         print("⚠ xarray não disponível, pulando teste")
         return True
     
     try:
-        extractor = ReanalysisMaskExtractor(fake_file, 'eta_t')
-        extractor.load_data()
-        extractor.extract_mask()
-        
         original_shape = extractor.mask.shape
         
         # Degradar para resolução 3x mais grosseira
@@ -129,76 +172,126 @@ def test_mask_coarsening():
         
         # Verificar valores
         unique_vals = np.unique(coarsened_mask)
-        assert np.all(np.isin(unique_vals, [0, 1])), "Máscara degradada deve conter apenas 0 e 1"
-        
-        extractor.cleanup()
-        os.unlink(fake_file)
+        assert np.all((unique_vals == 0) | (unique_vals == 1)), "Máscara degradada deve conter apenas 0 e 1"
         
         print("✓ Teste passou!")
         return True
         
     except Exception as e:
         print(f"✗ Teste falhou: {e}")
-        if fake_file and os.path.exists(fake_file):
-            os.unlink(fake_file)
         return False
 
 
-def test_mask_export():
-    """Testa exportação de máscara."""
+def test_mask_export(loaded_extractor):
+    """Testa exportação de máscara (buffer em memória, arquivo ASCII e NetCDF)."""
     print("\nTeste 3: Exportação de Máscara")
     print("-" * 50)
     
-    fake_file = create_fake_reanalysis_file()
+    extractor = loaded_extractor
     
-    if fake_file is None:
+    if extractor is None:
         print("⚠ xarray não disponível, pulando teste")
         return True
     
+    import apply_mask
+    
+    # Exportar para buffer em memória (sem ida e volta ao disco)
+    buffer = io.StringIO()
+    extractor.export_mask(buffer)
+    text = buffer.getvalue()
+    
+    # Verificar que algo foi escrito
+    assert len(text) > 0, "Saída exportada está vazia"
+    
+    # Deve ter cabeçalho (saída começa com comentário)
+    assert text.startswith('#'), "Arquivo deve ter cabeçalho"
+    
+    # Deve ter dados
+    first_data_line = next((l for l in text.splitlines() if l.strip() and not l.startswith('#')), '')
+    first_data = np.array(first_data_line.split(), dtype=float)
+    assert first_data.size > 0, "Arquivo deve ter dados"
+    
+    # Verificar formato dos dados (5 colunas)
+    assert first_data.shape == (5,), "Dados devem ter 5 colunas"
+    
+    # Exportar para arquivos (ASCII e NetCDF, pela extensão) e ler de volta
+    # com o apply_mask: mesma máscara e mesmos eixos do extrator
+    tmpdir = tempfile.mkdtemp(dir=MEMORY_TMPDIR)
     try:
-        extractor = ReanalysisMaskExtractor(fake_file, 'eta_t')
-        extractor.load_data()
-        extractor.extract_mask()
-        
-        # Exportar
-        temp_output = tempfile.NamedTemporaryFile(delete=False, suffix='.asc')
-        temp_output.close()
-        
-        extractor.export_mask(temp_output.name)
-        
-        # Verificar arquivo foi criado
-        assert os.path.exists(temp_output.name), "Arquivo de saída não foi criado"
-        assert os.path.getsize(temp_output.name) > 0, "Arquivo de saída está vazio"
-        
-        # Verificar formato
-        with open(temp_output.name, 'r') as f:
-            lines = f.readlines()
+        for name in ('mask.asc', 'mask.nc'):
+            path = os.path.join(tmpdir, name)
+            extractor.export_mask(path)
+            assert os.path.getsize(path) > 0, f"{name} está vazio"
             
-        # Deve ter cabeçalho
-        header_lines = [l for l in lines if l.startswith('#')]
-        assert len(header_lines) > 0, "Arquivo deve ter cabeçalho"
-        
-        # Deve ter dados
-        data_lines = [l for l in lines if not l.startswith('#') and l.strip()]
-        assert len(data_lines) > 0, "Arquivo deve ter dados"
-        
-        # Verificar formato dos dados (5 colunas)
-        first_data_line = data_lines[0]
-        parts = first_data_line.split()
-        assert len(parts) == 5, "Dados devem ter 5 colunas"
-        
-        extractor.cleanup()
-        os.unlink(fake_file)
-        os.unlink(temp_output.name)
-        
-        print("✓ Teste passou!")
+            mask_lons, mask_lats, mask = apply_mask.load_mask(path)
+            np.testing.assert_allclose(mask_lons, extractor.lons, atol=1e-6)
+            np.testing.assert_allclose(mask_lats, extractor.lats, atol=1e-6)
+            np.testing.assert_array_equal(mask, extractor.mask)
+            print(f"✓ {name}: máscara lida de volta sem alterações")
+        
+        # Arquivo e buffer têm os mesmos dados (o cabeçalho tem data/hora)
+        with open(os.path.join(tmpdir, 'mask.asc')) as f:
+            file_data = [l for l in f if not l.startswith('#')]
+        assert file_data == [l + '\n' for l in text.splitlines() if not l.startswith('#')]
+    finally:
+        for name in os.listdir(tmpdir):
+            os.unlink(os.path.join(tmpdir, name))
+        os.rmdir(tmpdir)
+    
+    print("✓ Teste passou!")
+    return True
+
+
+def test_apply_mask_netcdf_io():
+    """Testa gravação e leitura de grades NetCDF pelo apply_mask."""
+    print("\nTeste: Grade NetCDF no apply_mask")
+    print("-" * 50)
+    
+    try:
+        import xarray  # noqa: F401
+    except ImportError:
+        print("⚠ xarray não disponível, pulando teste")
         return True
-        
-    except Exception as e:
-        print(f"✗ Teste falhou: {e}")
-        if fake_file and os.path.exists(fake_file):
-            os.unlink(fake_file)
-        return False
+    
+    import apply_mask
+    
+    lons = np.arange(-50.0, -45.0, 0.25)
+    lats = np.arange(-30.0, -27.0, 0.25)
+    rng = np.random.default_rng(0)
+    depth = np.round(rng.random((len(lats), len(lons))) * 4000, 2)
+    depth[:, :3] = 0
+    header = ['# Grade de teste', '# Espaçamento: 0.25']
+    
+    tmpdir = tempfile.mkdtemp(dir=MEMORY_TMPDIR)
+    try:
+        # Mesma grade gravada em ASCII e em NetCDF (pela extensão)
+        loaded = {}
+        for name in ('grid.asc', 'grid.nc'):
+            path = os.path.join(tmpdir, name)
+            apply_mask.save_grid(path, header, lons, lats, depth, 'mask.nc')
+            loaded[name] = apply_mask.load_grid(path)
+        
+        header_nc, lons_nc, lats_nc, depth_nc = loaded['grid.nc']
+        np.testing.assert_allclose(lons_nc, lons)
+        np.testing.assert_allclose(lats_nc, lats)
+        np.testing.assert_allclose(depth_nc, depth, atol=1e-3)
+        assert header_nc[:len(header)] == header, "Cabeçalho original perdido"
+        assert any('mask.nc' in line for line in header_nc), "Arquivo de máscara não registrado"
+        print("✓ Grade NetCDF lida de volta sem alterações")
+        
+        # As duas leituras dão a mesma grade
+        _, lons_asc, lats_asc, depth_asc = loaded['grid.asc']
+        np.testing.assert_allclose(lons_nc, lons_asc, atol=1e-6)
+        np.testing.assert_allclose(lats_nc, lats_asc, atol=1e-6)
+        np.testing.assert_allclose(depth_nc, depth_asc, atol=1e-2)
+        print("✓ Leituras ASCII e NetCDF coincidem")
+    finally:
+        for name in os.listdir(tmpdir):
+            os.unlink(os.path.join(tmpdir, name))
+        os.rmdir(tmpdir)
+    
+    print("✓ Teste passou!")
+    return True
 
 
 def test_preserve_boundaries():
@@ -208,19 +301,9 @@ def test_preserve_boundaries():
     print("="*70)
     
     try:
-        # Adicionar script apply_mask ao path
-        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'tools', 'reanalysis_mask', 'scripts'))
         from apply_mask import apply_mask
         
-        # Criar grade sintética global (-180 a +180)
-        lons_grid = np.arange(-180, 180.1, 0.3)
-        lats_grid = np.arange(-75, 75.1, 0.25)
-        depth_grid = np.random.rand(len(lats_grid), len(lons_grid)) * 5000
-        
-        # Criar máscara sintética (formato 0-360, menor domínio)
-        lons_mask = np.arange(0.05, 360.0, 0.3)
-        lats_mask = np.arange(-74.95, 75.0, 0.25)
-        mask = np.random.randint(0, 2, (len(lats_mask), len(lons_mask)))
+        lons_grid, lats_grid, depth_grid, lons_mask, lats_mask, mask = create_boundary_test_data()
         
         print("\nConfigurações:")
         print(f"  Grade: {len(lons_grid)} lons x {len(lats_grid)} lats")
@@ -288,18 +371,44 @@ def test_preserve_boundaries():
         return False
 
 
+def run_netcdf_tests():
+    """Executa os testes que compartilham o arquivo NetCDF sintético."""
+    results = []
+    
+    # Arquivo sintético criado uma única vez e compartilhado pelos testes
+    fake_file = create_fake_reanalysis_file()
+    
+    extractor = None
+    
+    try:
+        results.append(test_mask_extraction(fake_file))
+        
+        # Extrator carregado uma vez e reutilizado (operações não destrutivas)
+        extractor = create_loaded_extractor(fake_file)
+        results.append(test_mask_coarsening(extractor))
+        results.append(test_mask_export(extractor))
+        results.append(test_apply_mask_netcdf_io())
+    finally:
+        if extractor is not None:
+            extractor.cleanup()
+        if fake_file and os.path.exists(fake_file):
+            os.unlink(fake_file)
+    
+    return results
+
+
+def run_boundary_tests():
+    """Executa o teste de preservação de bordas (independente do NetCDF)."""
+    return [test_preserve_boundaries()]
+
+
 def main():
     """Executa todos os testes."""
     print("="*70)
     print(" TESTES: REANALYSIS MASK")
     print("="*70)
     
-    results = []
-    
-    results.append(test_mask_extraction())
-    results.append(test_mask_coarsening())
-    results.append(test_mask_export())
-    results.append(test_preserve_boundaries())
+    results = run_netcdf_tests() + run_boundary_tests()
     
     print("\n" + "="*70)
     print(" RESUMO DOS TESTES")
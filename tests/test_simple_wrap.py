@@ -11,34 +11,28 @@ def check_grid(filename):
     print(f"\nAnalisando: {filename}")
     print("-" * 60)
     
-    data = []
-    with open(filename, 'r') as f:
-        for line in f:
-            if line.startswith('#') or not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 5:
-                lon = float(parts[2])
-                lat = float(parts[3])
-                depth = float(parts[4])
-                
-                # Verificar apenas região equatorial e pontos críticos
-                if abs(lat) < 10 and (abs(lon - 180) < 1 or abs(lon + 180) < 1):
-                    data.append((lon, lat, depth))
+    # Ler colunas lon, lat, depth de uma vez (ignora comentários '#')
+    arr = np.loadtxt(filename, comments='#', usecols=(2, 3, 4), ndmin=2)
+    lon_all, lat_all, depth_all = arr[:, 0], arr[:, 1], arr[:, 2]
     
-    # Agrupar por longitude
-    lons_unique = sorted(set(d[0] for d in data))
+    # Verificar apenas região equatorial e pontos críticos
+    sel = (np.abs(lat_all) < 10) & ((np.abs(lon_all - 180) < 1) | (np.abs(lon_all + 180) < 1))
+    lon_sel = lon_all[sel]
+    depth_sel = depth_all[sel]
+    
+    # Agrupar por longitude (contagem, soma e zeros por grupo)
+    lons_unique, inverse = np.unique(lon_sel, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(lons_unique))
+    sums = np.bincount(inverse, weights=depth_sel, minlength=len(lons_unique))
+    zeros = np.bincount(inverse, weights=(depth_sel == 0), minlength=len(lons_unique)).astype(int)
     
     print(f"Pontos próximos a ±180° (lat entre -10° e 10°):")
     print(f"{'Longitude':<12} {'N° pontos':<12} {'Profund. média':<18} {'Status'}")
     print("-" * 60)
     
     has_zeros = False
-    for lon in lons_unique:
-        points = [d for d in data if d[0] == lon]
-        depths = [d[2] for d in points]
-        avg_depth = np.mean(depths)
-        n_zeros = sum(1 for d in depths if d == 0)
+    for lon, n_points, total, n_zeros in zip(lons_unique, counts, sums, zeros):
+        avg_depth = total / n_points
         
         if lon in [180.0, -180.0]:
             marker = " ← CRÍTICO"
@@ -51,7 +45,7 @@ def check_grid(filename):
         else:
             status = "✓ OK"
         
-        print(f"{lon:>10.1f}° {len(points):>10d} {avg_depth:>15.2f} m   {status}{marker}")
+        print(f"{lon:>10.1f}° {n_points:>10d} {avg_depth:>15.2f} m   {status}{marker}")
     
     return has_zeros
 
@@ -58,22 +58,23 @@ if success:
     lat_idx = np.argmin(np.abs(lats))
     depth_equator = depth[lat_idx, :]
     
+    # Status e marcadores de todos os pontos calculados de uma vez; o
+    # relatório é montado num único texto em vez de um print por ponto
+    is_zero = depth_equator == 0
+    status = np.where(depth_equator > 0, "✓", "✗ ZERO")
+    # Destacar pontos críticos próximos a ±180°
+    marker = np.where(np.abs(np.abs(lons) - 180) < 0.5, " ← CRÍTICO (±180°)", "")
+    
     print(f"\nProfundidades ao longo do equador (lat={lats[lat_idx]:.2f}°):")
     print("-" * 45)
-    for i, (lon, d) in enumerate(zip(lons, depth_equator)):
-        status = "✓" if d > 0 else "✗ ZERO"
-        # Destacar pontos críticos próximos a ±180°
-        if abs(lon - 180) < 0.5 or abs(lon + 180) < 0.5:
-            marker = " ← CRÍTICO (±180°)"
-        else:
-            marker = ""
-        print(f"  {status} Lon {lon:7.1f}°: {d:8.2f} m{marker}")
+    print("\n".join(f"  {st} Lon {lon:7.1f}°: {d:8.2f} m{mk}"
+                    for st, lon, d, mk in zip(status, lons, depth_equator, marker)))
     
     # Análise
     print("\n" + "="*70)
     print("ANÁLISE")
     print("="*70)
-    n_zeros = np.sum(depth_equator == 0)
+    n_zeros = np.count_nonzero(is_zero)
     n_ocean = np.sum(depth_equator > 0)
     
     # Verificar pontos específicos críticos
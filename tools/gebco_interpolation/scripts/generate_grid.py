@@ -16,6 +16,7 @@ Uso:
 import sys
 import os
 from datetime import datetime
+from pathlib import Path
 
 # Adicionar diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -27,15 +28,17 @@ from bathymetry_generator import BathymetryGridGenerator
 # CONFIGURAÇÕES - MODIFIQUE AQUI PARA SUA APLICAÇÃO
 # ============================================================================
 
-# Caminho para o arquivo GEBCO
-# Se executar de tools/gebco_interpolation/scripts/, usar caminho relativo
-# Se executar da raiz do projeto, usar caminho direto
-GEBCO_FILE = os.path.join(os.path.dirname(__file__), "../../../gebco_2025_sub_ice_topo/GEBCO_2025_sub_ice.nc")
-GEBCO_FILE = os.path.abspath(GEBCO_FILE)
+# Raiz do projeto (resolvida uma única vez a partir deste arquivo)
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Caminho para o arquivo GEBCO (relativo à raiz do projeto, funciona de
+# qualquer diretório de execução)
+GEBCO_FILE = str(PROJECT_ROOT / "gebco_2025_sub_ice_topo" / "GEBCO_2025_sub_ice.nc")
 
 # Espaçamento da grade em graus decimais
 # Use SPACING_LON (dx) e SPACING_LAT (dy) para espaçamentos diferentes
-# ou defina apenas GRID_SPACING para usar o mesmo valor em ambas direções
+# ou defina-os como None para usar GRID_SPACING em ambas direções
+GRID_SPACING = 0.25  # usado quando SPACING_LON/SPACING_LAT são None
 SPACING_LON = 0.3  # dx em graus
 SPACING_LAT = 0.3  # dy em graus
 
@@ -54,37 +57,38 @@ LAT_MAX = 5.0      # Latitude norte
 # LAT_MAX = 90.0
 
 # Diretório de saída
-OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "../../../output")
-OUTPUT_DIR = os.path.abspath(OUTPUT_DIR)
+OUTPUT_DIR = str(PROJECT_ROOT / "output")
 
 # Método de interpolação: 'linear', 'nearest', ou 'cubic'
 INTERPOLATION_METHOD = 'linear'
 
-# Usar processamento paralelo?
+# Usar processamento paralelo? Só afeta os métodos 'slinear' e 'pchip' do
+# scipy: 'linear', 'nearest' e 'cubic' são interpolados em um único processo
 USE_PARALLEL = True
 
-# Número de workers (None = auto)
+# Número de workers (None = auto), também só para 'slinear'/'pchip'
 N_WORKERS = None
 
-# Função para gerar nome de arquivo de saída conforme configurações
-def generate_output_filename(ext="asc"):
-    # Espaçamento - usa SPACING_LON/LAT se definidos, senão usa GRID_SPACING padrão
-    dx = globals().get('SPACING_LON', globals().get('GRID_SPACING', 0.25))
-    dy = globals().get('SPACING_LAT', globals().get('GRID_SPACING', 0.25))
-    # Domínio
-    lon_str = f"lon{LON_MIN}_{LON_MAX}"
-    lat_str = f"lat{LAT_MIN}_{LAT_MAX}"
-    dx_str = f"dx{dx}"
-    dy_str = f"dy{dy}"
-    # Nome final
-    filename = f"rectangular_grid_{lon_str}_{lat_str}_{dx_str}_{dy_str}_gebco.{ext}"
-    return os.path.join(OUTPUT_DIR, filename)
-
-OUTPUT_FILE = generate_output_filename("asc")
+# Espaçamentos efetivos (resolvidos uma única vez)
+DX = SPACING_LON if SPACING_LON is not None else GRID_SPACING
+DY = SPACING_LAT if SPACING_LAT is not None else GRID_SPACING
+
+# Nomes de arquivo de saída conforme configurações (montados uma única vez)
+def build_output_paths(dx=DX, dy=DY):
+    """Retorna (arquivo .asc, arquivo .png, arquivo .nc) com o mesmo nome base."""
+    base = os.path.join(OUTPUT_DIR, f"rectangular_grid_lon{LON_MIN}_{LON_MAX}_lat{LAT_MIN}_{LAT_MAX}"
+                                     f"_dx{dx}_dy{dy}_gebco")
+    return f"{base}.asc", f"{base}.png", f"{base}.nc"
 
 # Gerar visualização?
 GENERATE_PLOT = True
-PLOT_FILE = generate_output_filename("png")
+
+# Salvar também a grade interpolada em NetCDF e reaproveitá-la nas próximas
+# execuções com a mesma configuração (evita repetir a interpolação).
+# Desligado por padrão: grava um arquivo .nc extra ao lado da grade ASCII
+SAVE_NETCDF = False
+
+OUTPUT_FILE, PLOT_FILE, NETCDF_FILE = build_output_paths()
 
 
 # ============================================================================
@@ -99,7 +103,7 @@ def main():
     print("="*70)
     print(" GERADOR DE GRADE BATIMÉTRICA PARA MODELO POM")
     print("="*70)
-    print(f"Versão: 2.0 (Paralelizada)")
+    print(f"Versão: 2.0")
     print(f"Data: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*70)
     
@@ -108,39 +112,37 @@ def main():
     
     try:
         # 1. Inicializar gerador
-        if globals().get('SPACING_LON') is not None and globals().get('SPACING_LAT') is not None:
-            generator = BathymetryGridGenerator(
-                GEBCO_FILE,
-                spacing_lon=globals().get('SPACING_LON'),
-                spacing_lat=globals().get('SPACING_LAT'),
-                n_workers=N_WORKERS
-            )
-        else:
-            generator = BathymetryGridGenerator(
-                GEBCO_FILE,
-                spacing=GRID_SPACING,
-                n_workers=N_WORKERS
-            )
-
-        # 2. Carregar dados do GEBCO
-        if not generator.load_gebco_data():
-            print("\nERRO: Falha ao carregar dados do GEBCO")
-            return 1
-
-        # 3. Definir extensão da grade
+        generator = BathymetryGridGenerator(
+            GEBCO_FILE,
+            spacing_lon=DX,
+            spacing_lat=DY,
+            n_workers=N_WORKERS
+        )
+
+        # 2. Definir extensão da grade
         generator.define_grid_extent(LON_MIN, LON_MAX, LAT_MIN, LAT_MAX)
 
-        # 4. Interpolar batimetria
-        if not generator.interpolate_bathymetry(method=INTERPOLATION_METHOD, parallel=USE_PARALLEL):
-            print("\nERRO: Falha na interpolação")
-            return 1
+        # 3. Reaproveitar grade já interpolada com a mesma configuração, ou
+        #    carregar o GEBCO e interpolar
+        if not (SAVE_NETCDF and generator.load_from_netcdf(NETCDF_FILE, INTERPOLATION_METHOD)):
+            if not generator.load_gebco_data():
+                print("\nERRO: Falha ao carregar dados do GEBCO")
+                return 1
+
+            # 4. Interpolar batimetria
+            if not generator.interpolate_bathymetry(method=INTERPOLATION_METHOD, parallel=USE_PARALLEL):
+                print("\nERRO: Falha na interpolação")
+                return 1
+
+            if SAVE_NETCDF:
+                generator.export_to_netcdf(NETCDF_FILE)
 
         # 5. Exportar para ASCII (formato POM - 5 colunas)
         if not generator.export_to_ascii(OUTPUT_FILE):
             print("\nERRO: Falha ao exportar arquivo")
             return 1
 
-        # 6. Gerar visualização (opcional)
+        # 6. Gerar visualização (opcional; pyplot só na thread principal)
         if GENERATE_PLOT:
             generator.plot_bathymetry(PLOT_FILE)
 
@@ -153,6 +155,8 @@ def main():
         print(f"\nArquivo de saída: {OUTPUT_FILE}")
         if GENERATE_PLOT:
             print(f"Visualização: {PLOT_FILE}")
+        if SAVE_NETCDF:
+            print(f"Grade NetCDF: {NETCDF_FILE}")
         print("\nPróximos passos:")
         print(f"  - Para editar a grade: ./ocean-tools.sh edit {os.path.basename(OUTPUT_FILE)}")
         print(f"  - Use a grade em seu modelo oceânico: {os.path.basename(OUTPUT_FILE)}")
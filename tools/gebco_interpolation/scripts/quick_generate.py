@@ -12,9 +12,11 @@ Uso:
 Exemplos:
     python quick_generate.py --region brasil_sul
     python quick_generate.py --lon-min -60 --lon-max -30 --lat-min -35 --lat-max -5
+    python quick_generate.py --batch regioes.json
 """
 
 import argparse
+import json
 import sys
 import os
 
@@ -61,6 +63,17 @@ Exemplos de uso:
   # Espaçamentos diferentes
   python quick_generate.py --dx 0.3 --dy 0.25
 
+  # Várias grades em uma única execução (GEBCO aberto uma só vez)
+  python quick_generate.py --batch regioes.json
+
+  Formato do arquivo JSON (lista de grades; campos omitidos usam as opções
+  da linha de comando):
+    [
+      {"region": "brasil_sul"},
+      {"lon_min": -45, "lon_max": -32, "lat_min": -18, "lat_max": -3,
+       "dx": 0.1, "dy": 0.1, "output": "nordeste.asc"}
+    ]
+
 Regiões pré-definidas:
   - global: Grade global (-180 a 180, -90 a 90) - PADRÃO
   - brasil_sul: Sul/Sudeste do Brasil
@@ -101,15 +114,27 @@ Regiões pré-definidas:
                        choices=['global', 'brasil_sul', 'brasil_nordeste', 'atlantico_sw'],
                        help='Usar região pré-definida (padrão: global)')
     
+    # Obsoletas: linear/nearest usam interpolação separável e cubic uma spline
+    # global, todas em um único processo. Aceitas só para não quebrar
+    # chamadas existentes (main() avisa quando usadas)
     parser.add_argument('--no-parallel', action='store_true',
-                       help='Desabilitar processamento paralelo')
+                       help="Obsoleto, sem efeito: todos os métodos deste script "
+                            "interpolam em um único processo")
     
     parser.add_argument('--workers', type=int, default=None,
-                       help='Número de workers (padrão: auto - todos menos 1)')
+                       help="Obsoleto, sem efeito: todos os métodos deste script "
+                            "interpolam em um único processo")
+    
+    parser.add_argument('--batch', type=str, default=None,
+                       help='Arquivo JSON com uma lista de grades a gerar na mesma execução')
     
     return parser.parse_args()
 
 
+# Campos que definem a região de uma entrada de lote sem 'region'
+BATCH_BOUNDS_KEYS = ('lon_min', 'lon_max', 'lat_min', 'lat_max')
+
+
 def get_predefined_region(region_name):
     """Retorna coordenadas de regiões pré-definidas."""
     regions = {
@@ -125,6 +150,13 @@ def main():
     """Função principal."""
     args = parse_arguments()
     
+    if args.no_parallel or args.workers is not None:
+        print("⚠ --no-parallel e --workers estão obsoletos e são ignorados: "
+              "todos os métodos interpolam em um único processo")
+    
+    if args.batch:
+        return run_batch(args)
+    
     # Determinar coordenadas
     if args.region:
         coords = get_predefined_region(args.region)
@@ -151,12 +183,6 @@ def main():
     if args.plot_output is None and not args.no_plot:
         args.plot_output = generate_output_filename(lon_min, lon_max, lat_min, lat_max, args.dx, args.dy, "png")
     
-    # Calcular workers (deixar 1 núcleo livre se não especificado)
-    if args.workers is None and not args.no_parallel:
-        import multiprocessing
-        total_cpus = multiprocessing.cpu_count()
-        args.workers = max(1, total_cpus - 1)
-    
     print("\n" + "="*70)
     print(" GERAÇÃO RÁPIDA DE GRADE BATIMÉTRICA")
     print("="*70)
@@ -165,7 +191,6 @@ def main():
     print(f"  Região: Lon [{lon_min}°, {lon_max}°], Lat [{lat_min}°, {lat_max}°]")
     print(f"  Espaçamento: dx={args.dx}°, dy={args.dy}°")
     print(f"  Método: {args.method}")
-    print(f"  Paralelo: {'Não' if args.no_parallel else f'Sim ({args.workers} workers)'}")
     print(f"  Saída: {args.output}")
     if not args.no_plot:
         print(f"  Visualização: {args.plot_output}")
@@ -179,35 +204,22 @@ def main():
         generator = BathymetryGridGenerator(
             args.gebco_file, 
             spacing_lon=args.dx,
-            spacing_lat=args.dy,
-            n_workers=args.workers
+            spacing_lat=args.dy
         )
         
         # Carregar dados
         if not generator.load_gebco_data():
             return 1
         
-        # Definir grade
-        generator.define_grid_extent(lon_min, lon_max, lat_min, lat_max)
-        
-        # Interpolar
-        if not generator.interpolate_bathymetry(
-            method=args.method, 
-            parallel=not args.no_parallel
-        ):
-            return 1
-        
-        # Exportar
-        if not generator.export_to_ascii(args.output):
-            return 1
-        
-        # Visualizar
-        if not args.no_plot:
-            generator.plot_bathymetry(args.plot_output)
+        ok = generate_grid(generator, (lon_min, lon_max, lat_min, lat_max),
+                           args, args.output, args.plot_output)
         
         # Limpar
         generator.cleanup()
         
+        if not ok:
+            return 1
+        
         print("\n" + "="*70)
         print(" ✓ CONCLUÍDO COM SUCESSO!")
         print("="*70)
@@ -223,5 +235,158 @@ def main():
         return 1
 
 
+def generate_grid(generator, bounds, args, output, plot_output):
+    """
+    Define, interpola e exporta uma grade com um gerador já carregado.
+    
+    Returns:
+        bool: True se a grade foi gerada com sucesso
+    """
+    lon_min, lon_max, lat_min, lat_max = bounds
+    
+    # Definir grade
+    generator.define_grid_extent(lon_min, lon_max, lat_min, lat_max)
+    
+    # Interpolar
+    if not generator.interpolate_bathymetry(
+        method=args.method
+    ):
+        return False
+    
+    # Exportar
+    if not generator.export_to_ascii(output):
+        return False
+    
+    # Visualizar
+    if not args.no_plot:
+        generator.plot_bathymetry(plot_output)
+    
+    return True
+
+
+def validate_batch_entry(entry):
+    """
+    Verifica uma entrada do arquivo de lote.
+    
+    Parameters:
+        entry: Item da lista lida do JSON
+    
+    Returns:
+        str: Descrição do problema, ou None se a entrada é válida
+    """
+    if not isinstance(entry, dict):
+        return f"esperado um objeto JSON, encontrado {type(entry).__name__}"
+    
+    if 'region' in entry:
+        if not isinstance(entry['region'], str) or get_predefined_region(entry['region']) is None:
+            return f"região '{entry['region']}' não reconhecida"
+    else:
+        missing = [k for k in BATCH_BOUNDS_KEYS if k not in entry]
+        if missing:
+            return f"sem 'region' e sem {', '.join(missing)}"
+        for k in BATCH_BOUNDS_KEYS:
+            if isinstance(entry[k], bool) or not isinstance(entry[k], (int, float)):
+                return f"'{k}' deve ser numérico, encontrado {entry[k]!r}"
+    
+    for k in ('dx', 'dy'):
+        if k in entry and (isinstance(entry[k], bool) or
+                           not isinstance(entry[k], (int, float)) or entry[k] <= 0):
+            return f"'{k}' deve ser um número positivo, encontrado {entry[k]!r}"
+    
+    for k in ('output', 'plot_output'):
+        if entry.get(k) is not None and not isinstance(entry[k], str):
+            return f"'{k}' deve ser um caminho (texto), encontrado {entry[k]!r}"
+    
+    return None
+
+
+def run_batch(args):
+    """
+    Gera várias grades descritas em um arquivo JSON em uma única execução.
+    
+    O arquivo GEBCO é aberto uma só vez e compartilhado entre os geradores
+    (cada entrada pode ter seu próprio espaçamento).
+    
+    Returns:
+        int: 0 se todas as grades foram geradas, 1 caso contrário
+    """
+    try:
+        with open(args.batch) as f:
+            entries = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"ERRO: Não foi possível ler o arquivo de lote '{args.batch}': {e}")
+        return 1
+    
+    if not isinstance(entries, list) or not entries:
+        print(f"ERRO: O arquivo de lote deve conter uma lista não vazia de grades")
+        return 1
+    
+    # Validar todas as entradas antes de abrir o GEBCO
+    errors = [(n, validate_batch_entry(entry)) for n, entry in enumerate(entries, start=1)]
+    errors = [(n, msg) for n, msg in errors if msg is not None]
+    if errors:
+        print(f"ERRO: Entradas inválidas no arquivo de lote '{args.batch}':")
+        for n, msg in errors:
+            print(f"  ✗ [{n}] {msg}")
+        return 1
+    
+    print("\n" + "="*70)
+    print(f" GERAÇÃO EM LOTE: {len(entries)} grade(s)")
+    print("="*70)
+    
+    owner = None  # gerador que abriu o GEBCO (fechado apenas no final)
+    failures = 0
+    
+    try:
+        for n, entry in enumerate(entries, start=1):
+            if 'region' in entry:
+                bounds = get_predefined_region(entry['region'])
+            else:
+                bounds = tuple(float(entry[k]) for k in BATCH_BOUNDS_KEYS)
+            
+            dx = entry.get('dx', args.dx)
+            dy = entry.get('dy', args.dy)
+            output = entry.get('output') or generate_output_filename(*bounds, dx, dy, "asc")
+            plot_output = entry.get('plot_output') or generate_output_filename(*bounds, dx, dy, "png")
+            
+            print(f"\n[{n}/{len(entries)}] Lon [{bounds[0]}°, {bounds[1]}°], "
+                  f"Lat [{bounds[2]}°, {bounds[3]}°], dx={dx}°, dy={dy}° → {output}")
+            
+            output_dir = os.path.dirname(output)
+            if output_dir:
+                os.makedirs(output_dir, exist_ok=True)
+            
+            generator = BathymetryGridGenerator(
+                args.gebco_file,
+                spacing_lon=dx,
+                spacing_lat=dy
+            )
+            
+            # Primeira grade abre o GEBCO; as demais reutilizam o mesmo dataset
+            shared = owner.gebco_data if owner is not None else None
+            if not generator.load_gebco_data(dataset=shared):
+                return 1
+            if owner is None:
+                owner = generator
+            
+            if not generate_grid(generator, bounds, args, output, plot_output):
+                failures += 1
+            
+            # Não fecha o dataset compartilhado
+            if generator is not owner:
+                generator.cleanup()
+    finally:
+        if owner is not None:
+            owner.cleanup()
+    
+    print("\n" + "="*70)
+    if failures == 0:
+        print(f" ✓ LOTE CONCLUÍDO: {len(entries)} grade(s) gerada(s)")
+    else:
+        print(f" ✗ LOTE CONCLUÍDO COM {failures} FALHA(S) de {len(entries)} grade(s)")
+    print("="*70 + "\n")
+    
+    return 0 if failures == 0 else 1
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -21,8 +21,9 @@ import xarray as xr
 from scipy.interpolate import RegularGridInterpolator
 import os
 import sys
+import gzip
 from datetime import datetime
-from multiprocessing import Pool, cpu_count
+from multiprocessing import Pool, cpu_count, shared_memory
 from functools import partial
 
 
@@ -30,8 +31,11 @@ class BathymetryGridGenerator:
     """
     Classe para gerar grades batimétricas interpoladas do GEBCO para o modelo POM.
     
-    Esta versão inclui suporte a processamento paralelo para acelerar a interpolação
-    de grades grandes.
+    Os métodos 'linear' e 'nearest' são interpolados por passes separáveis
+    vetorizados e 'cubic'/'quintic' pelo RegularGridInterpolator, todos em um
+    único processo. O processamento paralelo (n_workers, parallel=True) vale
+    só para os demais métodos locais do RegularGridInterpolator ('slinear',
+    'pchip').
     
     Attributes:
         gebco_file (str): Caminho para o arquivo NetCDF do GEBCO
@@ -43,9 +47,25 @@ class BathymetryGridGenerator:
         grid_lons (np.array): Longitudes da nova grade
         grid_lats (np.array): Latitudes da nova grade
         depth_grid (np.array): Profundidades interpoladas
-        n_workers (int): Número de processos paralelos a usar
+        n_workers (int): Número de processos paralelos ('slinear', 'pchip')
     """
     
+    # Tamanho (em pontos por lado) dos tiles da grade alvo na interpolação paralela
+    TILE_SIZE = 512
+    
+    # Métodos com interpolação separável dedicada (sem pool de processos)
+    SEPARABLE_METHODS = ('linear', 'nearest')
+    
+    # Splines globais: cada valor depende de toda a linha/coluna da origem,
+    # então um tile não pode usar só um recorte local; interpolados em série
+    GLOBAL_SPLINE_METHODS = ('cubic', 'quintic')
+    
+    # Máximo de pontos por eixo desenhados em plot_bathymetry
+    MAX_PLOT_POINTS = 2000
+    
+    # Buffer de escrita dos arquivos ASCII (bytes): menos chamadas write()
+    WRITE_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, gebco_file, spacing=None, spacing_lon=None, spacing_lat=None, n_workers=None):
         """
         Inicializa o gerador de grade batimétrica.
@@ -56,7 +76,8 @@ class BathymetryGridGenerator:
                            Se fornecido, aplica o mesmo espaçamento para lon e lat
             spacing_lon (float): Espaçamento em longitude (dx). Sobrescreve 'spacing' se fornecido
             spacing_lat (float): Espaçamento em latitude (dy). Sobrescreve 'spacing' se fornecido
-            n_workers (int): Número de processos paralelos. Se None, usa cpu_count()-1
+            n_workers (int): Número de processos paralelos. Se None, usa cpu_count()-1.
+                           Só usado pelos métodos 'slinear' e 'pchip'
         """
         self.gebco_file = gebco_file
         
@@ -76,9 +97,12 @@ class BathymetryGridGenerator:
         self.spacing = self.spacing_lon  # Para compatibilidade
         
         self.gebco_data = None
+        self._owns_gebco_data = False
+        self.gebco_bounds = None  # (lon_min, lon_max, lat_min, lat_max) do GEBCO
         self.grid_lons = None
         self.grid_lats = None
         self.depth_grid = None
+        self.interpolation_method = None
         
         # Configurar número de workers
         if n_workers is None:
@@ -93,22 +117,37 @@ class BathymetryGridGenerator:
         print(f"Inicializado gerador de grade:")
         print(f"  Espaçamento longitude (dx): {self.spacing_lon}°")
         print(f"  Espaçamento latitude (dy): {self.spacing_lat}°")
-        print(f"  Processamento paralelo: {self.n_workers} workers")
+        print(f"  Workers (métodos 'slinear'/'pchip'): {self.n_workers}")
     
     
-    def load_gebco_data(self):
+    def load_gebco_data(self, dataset=None):
         """
         Carrega os dados do GEBCO a partir do arquivo NetCDF.
         
         O GEBCO fornece dados globais de batimetria/topografia.
         As elevações positivas representam terra, valores negativos representam oceano.
+        
+        Parameters:
+            dataset (xarray.Dataset): Dataset GEBCO já aberto (opcional). Permite
+                                      reutilizar o mesmo arquivo aberto em vários
+                                      geradores (ex: grades com espaçamentos
+                                      diferentes) sem reabri-lo. Nesse caso,
+                                      cleanup() não fecha o dataset.
         """
         print(f"\nCarregando dados do GEBCO de: {self.gebco_file}")
         print("Aguarde, isso pode levar alguns momentos...")
         
         try:
-            # Carregar usando xarray (mais eficiente para arquivos grandes)
-            self.gebco_data = xr.open_dataset(self.gebco_file)
+            if dataset is not None:
+                self.gebco_data = dataset
+                self._owns_gebco_data = False
+            else:
+                # Abertura preguiçosa; cache=False evita que o xarray mantenha
+                # em memória os blocos de elevação já lidos. A grade GEBCO
+                # (~7 GB, int16) não é comprimida: o recorte regional é uma
+                # leitura direta de hyperslab, sem descompressão de chunks
+                self.gebco_data = xr.open_dataset(self.gebco_file, cache=False)
+                self._owns_gebco_data = True
             
             # Mostrar informações básicas do dataset
             print("\n" + "="*60)
@@ -121,12 +160,17 @@ class BathymetryGridGenerator:
             # Identificar nomes das variáveis (podem variar entre versões)
             self._identify_variable_names()
             
+            # Extensão calculada uma única vez (só coordenadas; a elevação
+            # é lida apenas após o recorte em interpolate_bathymetry)
+            lons = self.gebco_data[self.lon_name].values
+            lats = self.gebco_data[self.lat_name].values
+            self.gebco_bounds = (float(lons.min()), float(lons.max()),
+                                 float(lats.min()), float(lats.max()))
+            
             # Mostrar extensão (coordenadas são leves, elevação é pesada)
             print(f"\nExtensão dos dados:")
-            print(f"  Longitude: {float(self.gebco_data[self.lon_name].min()):.2f}° a "
-                  f"{float(self.gebco_data[self.lon_name].max()):.2f}°")
-            print(f"  Latitude: {float(self.gebco_data[self.lat_name].min()):.2f}° a "
-                  f"{float(self.gebco_data[self.lat_name].max()):.2f}°")
+            print(f"  Longitude: {self.gebco_bounds[0]:.2f}° a {self.gebco_bounds[1]:.2f}°")
+            print(f"  Latitude: {self.gebco_bounds[2]:.2f}° a {self.gebco_bounds[3]:.2f}°")
             # Não calcular min/max de elevação (muito pesado para dados grandes)
             print(f"  Elevação: carregada (range será calculado após subset)")
             print("="*60 + "\n")
@@ -143,29 +187,20 @@ class BathymetryGridGenerator:
         Identifica os nomes das variáveis no dataset GEBCO.
         Diferentes versões do GEBCO podem usar nomes diferentes.
         """
+        # Nomes presentes no arquivo (variables já inclui as coordenadas)
+        available = set(self.gebco_data.variables)
+        
         # Nomes comuns para longitude
         lon_candidates = ['lon', 'longitude', 'x']
-        self.lon_name = None
-        for name in lon_candidates:
-            if name in self.gebco_data.coords or name in self.gebco_data.variables:
-                self.lon_name = name
-                break
+        self.lon_name = next((name for name in lon_candidates if name in available), None)
         
         # Nomes comuns para latitude
         lat_candidates = ['lat', 'latitude', 'y']
-        self.lat_name = None
-        for name in lat_candidates:
-            if name in self.gebco_data.coords or name in self.gebco_data.variables:
-                self.lat_name = name
-                break
+        self.lat_name = next((name for name in lat_candidates if name in available), None)
         
         # Nomes comuns para elevação/batimetria
         elev_candidates = ['elevation', 'Band1', 'z', 'depth']
-        self.elev_name = None
-        for name in elev_candidates:
-            if name in self.gebco_data.variables:
-                self.elev_name = name
-                break
+        self.elev_name = next((name for name in elev_candidates if name in available), None)
         
         if not all([self.lon_name, self.lat_name, self.elev_name]):
             raise ValueError("Não foi possível identificar todas as variáveis necessárias no arquivo GEBCO")
@@ -176,6 +211,21 @@ class BathymetryGridGenerator:
         print(f"  Elevação: {self.elev_name}")
     
     
+    @staticmethod
+    def _axis(start, stop, spacing):
+        """
+        Vetor de coordenadas de start até cobrir stop, com passo spacing.
+        
+        Mesmo resultado pretendido por np.arange(start, stop + spacing, spacing)
+        (ceil((stop - start) / spacing) + 1 pontos), mas com o número de pontos
+        calculado explicitamente: o ruído de ponto flutuante não acrescenta um
+        ponto extra além de stop quando a divisão é exata (ex: 10 / 0.2).
+        """
+        n_points = int(np.ceil(round((stop - start) / spacing, 9))) + 1
+        # Limite a meio passo do último ponto: exatamente n_points valores
+        return np.arange(start, start + (n_points - 0.5) * spacing, spacing)
+    
+    
     def define_grid_extent(self, lon_min, lon_max, lat_min, lat_max):
         """
         Define a extensão geográfica da grade a ser gerada.
@@ -200,13 +250,13 @@ class BathymetryGridGenerator:
         if lon_max < lon_min:
             print(f"  ⚠ Grade cruza linha de data (±180°)")
             # Criar grade que cruza ±180°: de lon_min até 180, depois de -180 até lon_max
-            lons_east = np.arange(lon_min, 180.0 + self.spacing_lon, self.spacing_lon)
-            lons_west = np.arange(-180.0, lon_max + self.spacing_lon, self.spacing_lon)
+            lons_east = self._axis(lon_min, 180.0, self.spacing_lon)
+            lons_west = self._axis(-180.0, lon_max, self.spacing_lon)
             self.grid_lons = np.concatenate([lons_east, lons_west])
         else:
-            self.grid_lons = np.arange(lon_min, lon_max + self.spacing_lon, self.spacing_lon)
+            self.grid_lons = self._axis(lon_min, lon_max, self.spacing_lon)
         
-        self.grid_lats = np.arange(lat_min, lat_max + self.spacing_lat, self.spacing_lat)
+        self.grid_lats = self._axis(lat_min, lat_max, self.spacing_lat)
         
         n_lons = len(self.grid_lons)
         n_lats = len(self.grid_lats)
@@ -219,25 +269,60 @@ class BathymetryGridGenerator:
     @staticmethod
     def _interpolate_chunk(args):
         """
-        Função auxiliar para interpolar um chunk de dados em paralelo.
+        Função auxiliar para interpolar um bloco (tile) da grade em paralelo.
         
-        Parameters:
-            args (tuple): (lat_indices, interpolator, grid_lons, grid_lats)
+        A elevação de origem é lida de um bloco de memória compartilhada
+        e o resultado é escrito diretamente na grade de saída, também em
+        memória compartilhada (nada trafega via pickle). Cada worker recria
+        o interpolador apenas sobre o recorte da origem que cobre o seu tile,
+        o que mantém os acessos concentrados em uma região pequena da memória.
         
-        Returns:
-            tuple: (lat_indices, interpolated_data)
+        Parameters:
+            args (tuple): (lat_slice, lon_slice, shm_name, shape, dtype,
+                           out_shm_name, out_shape,
+                           src_lats, src_lons, method, grid_lons, grid_lats)
         """
-        lat_indices, interpolator, grid_lons, grid_lats = args
+        (lat_slice, lon_slice, shm_name, shape, dtype, out_shm_name, out_shape,
+         src_lats, src_lons, method, grid_lons, grid_lats) = args
+        
+        tile_lats = grid_lats[lat_slice]
+        tile_lons = grid_lons[lon_slice]
         
-        # Criar sub-malha para este chunk
-        lon_mesh, lat_mesh = np.meshgrid(grid_lons, grid_lats[lat_indices])
-        points = np.column_stack([lat_mesh.ravel(), lon_mesh.ravel()])
+        # Recorte da origem usado pelo tile: os intervalos que o
+        # RegularGridInterpolator escolheria sobre a grade completa, mais
+        # dois pontos de cada lado (derivadas locais de 'pchip'). Vale só
+        # para métodos locais; splines globais (GLOBAL_SPLINE_METHODS)
+        # não passam por aqui
+        def source_range(src, tgt):
+            idx = np.clip(np.searchsorted(src, tgt) - 1, 0, len(src) - 2)
+            return slice(max(int(idx.min()) - 2, 0), min(int(idx.max()) + 4, len(src)))
         
-        # Interpolar
-        elevation_chunk = interpolator(points)
-        elevation_chunk = elevation_chunk.reshape(len(lat_indices), len(grid_lons))
+        src_lat_slice = source_range(src_lats, tile_lats)
+        src_lon_slice = source_range(src_lons, tile_lons)
         
-        return (lat_indices, elevation_chunk)
+        shm = shared_memory.SharedMemory(name=shm_name)
+        out_shm = shared_memory.SharedMemory(name=out_shm_name)
+        try:
+            elevation = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+            output = np.ndarray(out_shape, dtype=np.float32, buffer=out_shm.buf)
+            interpolator = RegularGridInterpolator(
+                (src_lats[src_lat_slice], src_lons[src_lon_slice]),
+                elevation[src_lat_slice, src_lon_slice],
+                method=method,
+                bounds_error=False,
+                fill_value=0
+            )
+            
+            # Interpolar sobre os eixos do tile (broadcast lat x lon) e
+            # gravar no trecho correspondente da saída
+            output[lat_slice, lon_slice] = interpolator(
+                (tile_lats[:, np.newaxis], tile_lons[np.newaxis, :]))
+            
+            # Liberar referências aos buffers antes de fechar
+            del interpolator, elevation, output
+        finally:
+            shm.close()
+            out_shm.close()
     
     
     def interpolate_bathymetry(self, method='linear', parallel=True):
@@ -245,9 +330,11 @@ class BathymetryGridGenerator:
         Interpola os dados do GEBCO para a nova grade definida.
         
         Parameters:
-            method (str): Método de interpolação ('linear', 'nearest', 'cubic')
+            method (str): Método de interpolação ('linear', 'nearest', 'cubic';
+                         também 'slinear', 'pchip', 'quintic' do scipy)
                          Padrão: 'linear' (bom equilíbrio entre precisão e velocidade)
-            parallel (bool): Se True, usa processamento paralelo
+            parallel (bool): Se True, usa processamento paralelo nos métodos
+                             'slinear' e 'pchip'; sem efeito nos demais
         
         Returns:
             bool: True se a interpolação foi bem-sucedida
@@ -262,18 +349,18 @@ class BathymetryGridGenerator:
         
         print(f"\nIniciando interpolação dos dados do GEBCO...")
         print(f"Método de interpolação: {method}")
-        print(f"Processamento paralelo: {'Sim' if parallel and self.n_workers > 1 else 'Não'}")
+        use_pool = (parallel and self.n_workers > 1
+                    and method not in self.SEPARABLE_METHODS
+                    and method not in self.GLOBAL_SPLINE_METHODS)
+        print(f"Processamento paralelo: {'Sim' if use_pool else 'Não'}")
         
         try:
             # Extrair subset dos dados do GEBCO na região de interesse
             # Adicionar uma margem para garantir boa interpolação nas bordas
             margin = 1.0  # graus
             
-            # Obter limites do GEBCO
-            gebco_lon_min = float(self.gebco_data[self.lon_name].min())
-            gebco_lon_max = float(self.gebco_data[self.lon_name].max())
-            gebco_lat_min = float(self.gebco_data[self.lat_name].min())
-            gebco_lat_max = float(self.gebco_data[self.lat_name].max())
+            # Limites do GEBCO (calculados em load_gebco_data)
+            gebco_lon_min, gebco_lon_max, gebco_lat_min, gebco_lat_max = self.gebco_bounds
             
             lat_extract_min = max(self.lat_min - margin, gebco_lat_min)
             lat_extract_max = min(self.lat_max + margin, gebco_lat_max)
@@ -281,6 +368,11 @@ class BathymetryGridGenerator:
             print(f"Limites do GEBCO: lon [{gebco_lon_min:.2f}, {gebco_lon_max:.2f}], "
                   f"lat [{gebco_lat_min:.2f}, {gebco_lat_max:.2f}]")
             
+            # Recortar apenas a variável de elevação: a leitura é preguiçosa e
+            # só a região selecionada é lida do disco (outras variáveis do
+            # arquivo não são tocadas, nem mesmo no concat da linha de data)
+            elevation = self.gebco_data[self.elev_name]
+            
             # Verificar se cruza a linha de data
             if self.lon_max < self.lon_min:
                 print(f"Grade cruza ±180° - extraindo dois subsets")
@@ -294,18 +386,22 @@ class BathymetryGridGenerator:
                 print(f"  Lado leste: lon [{lon_extract_east_min:.2f}, {lon_extract_east_max:.2f}]")
                 print(f"  Lado oeste: lon [{lon_extract_west_min:.2f}, {lon_extract_west_max:.2f}]")
                 
-                subset_east = self.gebco_data.sel(
+                subset_east = elevation.sel(
                     {self.lon_name: slice(lon_extract_east_min, lon_extract_east_max),
                      self.lat_name: slice(lat_extract_min, lat_extract_max)}
                 )
-                subset_west = self.gebco_data.sel(
+                subset_west = elevation.sel(
                     {self.lon_name: slice(lon_extract_west_min, lon_extract_west_max),
                      self.lat_name: slice(lat_extract_min, lat_extract_max)}
                 )
                 
-                # Concatenar os dois subsets
-                import xarray as xr
-                gebco_subset = xr.concat([subset_east, subset_west], dim=self.lon_name)
+                # Concatenar os dois subsets diretamente nos arrays (sem
+                # montar um novo objeto xarray)
+                gebco_lons = np.concatenate([subset_east[self.lon_name].values,
+                                             subset_west[self.lon_name].values])
+                gebco_lats = subset_east[self.lat_name].values
+                gebco_elevation = np.concatenate([subset_east.values, subset_west.values],
+                                                 axis=subset_east.get_axis_num(self.lon_name))
                 print(f"  Subsets concatenados")
             else:
                 # Extração normal
@@ -314,17 +410,22 @@ class BathymetryGridGenerator:
                 print(f"Limites de extração: lon [{lon_extract_min:.2f}, {lon_extract_max:.2f}], "
                       f"lat [{lat_extract_min:.2f}, {lat_extract_max:.2f}]")
                 
-                gebco_subset = self.gebco_data.sel(
+                gebco_subset = elevation.sel(
                     {self.lon_name: slice(lon_extract_min, lon_extract_max),
                      self.lat_name: slice(lat_extract_min, lat_extract_max)}
                 )
+                
+                # Obter arrays de coordenadas e dados
+                gebco_lons = gebco_subset[self.lon_name].values
+                gebco_lats = gebco_subset[self.lat_name].values
+                gebco_elevation = gebco_subset.values
             
-            print(f"Subset extraído: {dict(gebco_subset.sizes)}")
+            print(f"Subset extraído: {{'{self.lat_name}': {len(gebco_lats)}, "
+                  f"'{self.lon_name}': {len(gebco_lons)}}}")
             
-            # Obter arrays de coordenadas e dados
-            gebco_lons = gebco_subset[self.lon_name].values
-            gebco_lats = gebco_subset[self.lat_name].values
-            gebco_elevation = gebco_subset[self.elev_name].values
+            # float32 basta para elevações inteiras em metros e reduz pela
+            # metade a memória movimentada na interpolação
+            gebco_elevation = gebco_elevation.astype(np.float32, copy=False)
             
             # Verificar se a grade cruza a linha de data (±180°)
             crosses_dateline = self.lon_max < self.lon_min
@@ -373,32 +474,56 @@ class BathymetryGridGenerator:
                                                 grid_lons_for_interp)
                 print(f"  Longitudes da grade convertidas para interpolação")
             
-            # Criar interpolador
-            print("Criando interpolador...")
-            interpolator = RegularGridInterpolator(
-                (gebco_lats, gebco_lons),
-                gebco_elevation,
-                method=method,
-                bounds_error=False,
-                fill_value=0
-            )
-            
-            # Interpolar (usar grid_lons_for_interp ao invés de self.grid_lons)
-            if parallel and self.n_workers > 1:
+            if method == 'linear':
+                # Bilinear também é separável: dois passes vetorizados
+                print("Interpolando (bilinear separável)...")
+                elevation_interp = self._interpolate_linear_separable(
+                    gebco_lats, gebco_lons, gebco_elevation, grid_lons_for_interp
+                )
+            elif method == 'nearest':
+                # Vizinho mais próximo: índice escolhido por eixo e leitura em bloco
+                print("Interpolando (vizinho mais próximo por eixo)...")
+                elevation_interp = self._interpolate_nearest_separable(
+                    gebco_lats, gebco_lons, gebco_elevation, grid_lons_for_interp
+                )
+            elif use_pool:
+                # Demais métodos locais do scipy ('slinear', 'pchip'): workers
+                # recriam o interpolador a partir de memória compartilhada
                 print(f"Interpolando em paralelo usando {self.n_workers} workers...")
-                elevation_interp = self._interpolate_parallel(interpolator, grid_lons_for_interp)
+                elevation_interp = self._interpolate_parallel(
+                    gebco_lats, gebco_lons, gebco_elevation, method, grid_lons_for_interp
+                )
             else:
+                # Criar interpolador
+                print("Criando interpolador...")
+                interpolator = RegularGridInterpolator(
+                    (gebco_lats, gebco_lons),
+                    gebco_elevation,
+                    method=method,
+                    bounds_error=False,
+                    fill_value=0
+                )
+                
+                # Interpolar (usar grid_lons_for_interp ao invés de self.grid_lons)
                 print("Interpolando...")
                 elevation_interp = self._interpolate_serial(interpolator, grid_lons_for_interp)
             
-            # Converter elevação para profundidade (inverter sinal para oceano)
-            self.depth_grid = np.where(elevation_interp < 0, -elevation_interp, 0)
+            # Converter elevação para profundidade (inverter sinal para oceano),
+            # no próprio array interpolado: depth = max(0 - z, 0); 0 - z evita
+            # -0.0 e fmax leva NaN a 0, como o np.where anterior
+            depth_grid = elevation_interp.astype(np.float32, copy=False)
+            np.subtract(0, depth_grid, out=depth_grid)
+            np.fmax(depth_grid, 0, out=depth_grid)
+            self.depth_grid = depth_grid
+            
+            self.interpolation_method = method
             
-            # Estatísticas
-            ocean_points = np.sum(self.depth_grid > 0)
-            land_points = np.sum(self.depth_grid == 0)
-            max_depth = np.max(self.depth_grid)
-            mean_depth = np.mean(self.depth_grid[self.depth_grid > 0]) if ocean_points > 0 else 0
+            # Estatísticas (profundidade >= 0: terra é exatamente 0, então a
+            # soma da grade inteira é a soma do oceano; sem máscaras extras)
+            ocean_points = int(np.count_nonzero(depth_grid))
+            land_points = depth_grid.size - ocean_points
+            max_depth = depth_grid.max()
+            mean_depth = depth_grid.sum(dtype=np.float64) / ocean_points if ocean_points > 0 else 0
             
             print("\n" + "="*60)
             print("INTERPOLAÇÃO CONCLUÍDA")
@@ -418,6 +543,98 @@ class BathymetryGridGenerator:
             return False
     
     
+    @staticmethod
+    def _linear_axis_weights(src, tgt):
+        """
+        Índices e pesos de interpolação linear 1-D (mesma convenção do
+        RegularGridInterpolator: intervalo [src[i], src[i+1]] com i limitado).
+        
+        Returns:
+            tuple: (idx, weights, out_of_bounds)
+        """
+        idx = np.clip(np.searchsorted(src, tgt) - 1, 0, len(src) - 2)
+        weights = (tgt - src[idx]) / (src[idx + 1] - src[idx])
+        out_of_bounds = (tgt < src[0]) | (tgt > src[-1])
+        return idx, weights, out_of_bounds
+    
+    
+    def _interpolate_linear_separable(self, src_lats, src_lons, elevation, grid_lons=None):
+        """
+        Interpolação bilinear separável para a grade alvo retilínea.
+        
+        Os pesos são calculados uma vez por eixo e os quatro vizinhos de cada
+        ponto são obtidos por indexação em bloco (np.ix_), sem avaliar ponto a
+        ponto. Equivale ao RegularGridInterpolator(method='linear').
+        Pontos fora do domínio dos dados recebem 0 (como fill_value=0).
+        
+        Parameters:
+            src_lats: Latitudes dos dados de origem (crescentes)
+            src_lons: Longitudes dos dados de origem (crescentes)
+            elevation: Elevação de origem [lat, lon]
+            grid_lons: Array de longitudes (se None, usa self.grid_lons)
+        
+        Returns:
+            np.array: Dados interpolados
+        """
+        if grid_lons is None:
+            grid_lons = self.grid_lons
+        
+        i_lat, w_lat, lat_out = self._linear_axis_weights(src_lats, self.grid_lats)
+        i_lon, w_lon, lon_out = self._linear_axis_weights(src_lons, grid_lons)
+        
+        # Pesos calculados em float64 (a partir das coordenadas) e aplicados
+        # em float32, o mesmo dtype da elevação
+        w_lat = w_lat.astype(np.float32)[:, np.newaxis]
+        w_lon = w_lon.astype(np.float32)
+        
+        south = (elevation[np.ix_(i_lat, i_lon)] * (1 - w_lon) +
+                 elevation[np.ix_(i_lat, i_lon + 1)] * w_lon)
+        north = (elevation[np.ix_(i_lat + 1, i_lon)] * (1 - w_lon) +
+                 elevation[np.ix_(i_lat + 1, i_lon + 1)] * w_lon)
+        elevation_interp = south * (1 - w_lat) + north * w_lat
+        
+        # Fora do domínio: mesmo comportamento de bounds_error=False, fill_value=0
+        elevation_interp[lat_out, :] = 0
+        elevation_interp[:, lon_out] = 0
+        
+        return elevation_interp
+    
+    
+    def _interpolate_nearest_separable(self, src_lats, src_lons, elevation, grid_lons=None):
+        """
+        Interpolação por vizinho mais próximo para a grade alvo retilínea.
+        
+        O vizinho é escolhido independentemente em cada eixo (mesma regra do
+        RegularGridInterpolator(method='nearest'): em empate, o menor índice)
+        e os valores são lidos em bloco com np.ix_.
+        Pontos fora do domínio dos dados recebem 0 (como fill_value=0).
+        
+        Parameters:
+            src_lats: Latitudes dos dados de origem (crescentes)
+            src_lons: Longitudes dos dados de origem (crescentes)
+            elevation: Elevação de origem [lat, lon]
+            grid_lons: Array de longitudes (se None, usa self.grid_lons)
+        
+        Returns:
+            np.array: Dados interpolados
+        """
+        if grid_lons is None:
+            grid_lons = self.grid_lons
+        
+        i_lat, w_lat, lat_out = self._linear_axis_weights(src_lats, self.grid_lats)
+        i_lon, w_lon, lon_out = self._linear_axis_weights(src_lons, grid_lons)
+        i_lat = np.where(w_lat <= 0.5, i_lat, i_lat + 1)
+        i_lon = np.where(w_lon <= 0.5, i_lon, i_lon + 1)
+        
+        elevation_interp = np.asarray(elevation, dtype=np.float32)[np.ix_(i_lat, i_lon)]
+        
+        # Fora do domínio: mesmo comportamento de bounds_error=False, fill_value=0
+        elevation_interp[lat_out, :] = 0
+        elevation_interp[:, lon_out] = 0
+        
+        return elevation_interp
+    
+    
     def _interpolate_serial(self, interpolator, grid_lons=None):
         """
         Interpolação serial (sem paralelização).
@@ -431,18 +648,28 @@ class BathymetryGridGenerator:
         """
         if grid_lons is None:
             grid_lons = self.grid_lons
-        lon_mesh, lat_mesh = np.meshgrid(grid_lons, self.grid_lats)
-        points = np.column_stack([lat_mesh.ravel(), lon_mesh.ravel()])
-        elevation_interp = interpolator(points)
-        return elevation_interp.reshape(lon_mesh.shape)
+        # A grade alvo é retilínea: passar os eixos em broadcast (lat x lon)
+        # em vez de montar meshgrid + column_stack com todos os pontos
+        return interpolator((self.grid_lats[:, np.newaxis], grid_lons[np.newaxis, :]))
     
     
-    def _interpolate_parallel(self, interpolator, grid_lons=None):
+    def _interpolate_parallel(self, src_lats, src_lons, elevation, method, grid_lons=None):
         """
-        Interpolação paralela dividindo por linhas de latitude.
+        Interpolação paralela dividindo a grade alvo em tiles 2-D.
+        
+        Apenas para métodos locais ('slinear', 'pchip'): cada tile usa só o
+        recorte da origem em volta dele, o que não vale para as splines
+        globais (GLOBAL_SPLINE_METHODS), interpoladas em série.
+        
+        A elevação de origem é copiada uma vez para memória compartilhada e a
+        grade de saída é alocada também em memória compartilhada; os workers
+        recebem apenas os nomes dos blocos e escrevem seus tiles no lugar.
         
         Parameters:
-            interpolator: Interpolador RegularGridInterpolator
+            src_lats: Latitudes dos dados de origem (crescentes)
+            src_lons: Longitudes dos dados de origem (crescentes)
+            elevation: Elevação de origem [lat, lon]
+            method (str): Método de interpolação do RegularGridInterpolator
             grid_lons: Array de longitudes (se None, usa self.grid_lons)
         
         Returns:
@@ -452,25 +679,45 @@ class BathymetryGridGenerator:
             grid_lons = self.grid_lons
             
         n_lats = len(self.grid_lats)
+        n_lons = len(grid_lons)
         
-        # Dividir latitudes em chunks para processamento paralelo
-        chunk_size = max(1, n_lats // self.n_workers)
-        chunks = []
-        
-        for i in range(0, n_lats, chunk_size):
-            lat_indices = range(i, min(i + chunk_size, n_lats))
-            chunks.append((lat_indices, interpolator, grid_lons, self.grid_lats))
-        
-        # Processar chunks em paralelo
-        elevation_interp = np.zeros((n_lats, len(grid_lons)))
+        # float32 (dtype de ponto flutuante): o interpolador usa o buffer
+        # diretamente, sem converter
+        elevation = np.asarray(elevation, dtype=np.float32)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, elevation.nbytes))
+        out_shm = shared_memory.SharedMemory(create=True, size=max(1, n_lats * n_lons * 4))
         
-        with Pool(processes=self.n_workers) as pool:
-            results = pool.map(self._interpolate_chunk, chunks)
-        
-        # Combinar resultados
-        for lat_indices, chunk_data in results:
-            for idx, lat_idx in enumerate(lat_indices):
-                elevation_interp[lat_idx, :] = chunk_data[idx, :]
+        try:
+            shared = np.ndarray(elevation.shape, dtype=elevation.dtype, buffer=shm.buf)
+            shared[...] = elevation
+            output = np.ndarray((n_lats, n_lons), dtype=np.float32, buffer=out_shm.buf)
+            
+            # Dividir a grade alvo em tiles 2-D para processamento paralelo
+            tile = self.TILE_SIZE
+            chunks = []
+            
+            for i0 in range(0, n_lats, tile):
+                for j0 in range(0, n_lons, tile):
+                    chunks.append((slice(i0, min(i0 + tile, n_lats)),
+                                   slice(j0, min(j0 + tile, n_lons)),
+                                   shm.name, elevation.shape, elevation.dtype,
+                                   out_shm.name, (n_lats, n_lons),
+                                   src_lats, src_lons, method, grid_lons, self.grid_lats))
+            
+            # Processar tiles em paralelo (cada worker preenche seu tile)
+            with Pool(processes=self.n_workers) as pool:
+                for _ in pool.imap_unordered(self._interpolate_chunk, chunks):
+                    pass
+            
+            # Cópia única para memória própria antes de liberar o bloco
+            elevation_interp = output.copy()
+            
+            del shared, output
+        finally:
+            shm.close()
+            shm.unlink()
+            out_shm.close()
+            out_shm.unlink()
         
         return elevation_interp
     
@@ -483,7 +730,9 @@ class BathymetryGridGenerator:
             i  j  lon  lat  depth
         
         Parameters:
-            output_file (str): Caminho para o arquivo de saída
+            output_file (str): Caminho para o arquivo de saída. Se terminar em
+                               '.gz', o arquivo é gravado comprimido (gzip nível 1,
+                               rápido; a grade ASCII é muito redundante)
             format_spec (str): Especificação de formato para numpy.savetxt
         
         Returns:
@@ -499,22 +748,14 @@ class BathymetryGridGenerator:
             # Criar arrays de índices
             n_lats, n_lons = self.depth_grid.shape
             
-            # Preparar dados para exportação
-            data_list = []
-            
-            # Iterar sobre a grade
-            for j in range(n_lats):
-                for i in range(n_lons):
-                    i_idx = i + 1
-                    j_idx = j + 1
-                    lon = self.grid_lons[i]
-                    lat = self.grid_lats[j]
-                    depth = self.depth_grid[j, i]
-                    
-                    data_list.append([i_idx, j_idx, lon, lat, depth])
-            
-            # Converter para array numpy
-            data_array = np.array(data_list)
+            # Montar colunas de uma vez (j externo, i interno; índices a partir de 1)
+            data_array = np.column_stack([
+                np.tile(np.arange(1, n_lons + 1), n_lats),
+                np.repeat(np.arange(1, n_lats + 1), n_lons),
+                np.tile(self.grid_lons, n_lats),
+                np.repeat(self.grid_lats, n_lons),
+                self.depth_grid.ravel(),
+            ])
             
             # Criar cabeçalho descritivo
             header = f"""Grade batimétrica para modelo POM
@@ -522,21 +763,26 @@ Gerada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 Fonte: GEBCO 2025
 Espaçamento: {self.spacing}° ({self.spacing * 111:.1f} km no equador)
 Extensão: Lon [{self.lon_min}°, {self.lon_max}°], Lat [{self.lat_min}°, {self.lat_max}°]
-Dimensões: {n_lons} x {n_lats} = {len(data_list)} pontos
+Dimensões: {n_lons} x {n_lats} = {len(data_array)} pontos
 Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
 """
             
-            # Salvar arquivo
-            np.savetxt(
-                output_file,
-                data_array,
-                fmt=format_spec,
-                header=header,
-                comments='# '
-            )
+            # Salvar arquivo (.gz: compressão rápida em fluxo durante a escrita)
+            if output_file.endswith('.gz'):
+                with gzip.open(output_file, 'wt', compresslevel=1) as f:
+                    np.savetxt(f, data_array, fmt=format_spec, header=header, comments='# ')
+            else:
+                with open(output_file, 'w', buffering=self.WRITE_BUFFER_SIZE) as f:
+                    np.savetxt(
+                        f,
+                        data_array,
+                        fmt=format_spec,
+                        header=header,
+                        comments='# '
+                    )
             
             print(f"✓ Arquivo salvo com sucesso!")
-            print(f"  Total de linhas: {len(data_list)}")
+            print(f"  Total de linhas: {len(data_array)}")
             print(f"  Tamanho do arquivo: {os.path.getsize(output_file) / 1024:.1f} KB")
             
             return True
@@ -556,7 +802,7 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
             output_file (str): Caminho para salvar a figura (opcional)
         """
         try:
-            import matplotlib.pyplot as plt
+            from matplotlib import cm
             from matplotlib.colors import LinearSegmentedColormap
             import cartopy.crs as ccrs
             import cartopy.feature as cfeature
@@ -569,26 +815,42 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
 
             # Usar Cartopy se disponível
             proj = ccrs.PlateCarree()
-            fig, ax = plt.subplots(figsize=(12, 8), subplot_kw={'projection': proj})
+            if output_file:
+                # Renderização fora da tela (Agg): não depende de backend interativo
+                from matplotlib.figure import Figure
+                from matplotlib.backends.backend_agg import FigureCanvasAgg
+                fig = Figure(figsize=(12, 8))
+                FigureCanvasAgg(fig)
+                ax = fig.add_subplot(projection=proj)
+            else:
+                # pyplot (e backend interativo) só quando a figura será exibida
+                import matplotlib.pyplot as plt
+                fig, ax = plt.subplots(figsize=(12, 8), subplot_kw={'projection': proj})
             ax.set_extent([self.lon_min, self.lon_max, self.lat_min, self.lat_max], crs=proj)
             # Adicionar linha de costa
             ax.add_feature(cfeature.COASTLINE, linewidth=2, edgecolor='black')
             ax.add_feature(cfeature.BORDERS, linestyle=':', edgecolor='gray')
             ax.add_feature(cfeature.LAND, facecolor='lightgray')
             # Criar mapa de cores apropriado (azul para oceano)
-            colors_ocean = plt.cm.Blues_r(np.linspace(0.2, 1, 256))
+            colors_ocean = cm.Blues_r(np.linspace(0.2, 1, 256))
             cmap_ocean = LinearSegmentedColormap.from_list('ocean', colors_ocean)
 
-            # Plotar batimetria
-            lon_mesh, lat_mesh = np.meshgrid(self.grid_lons, self.grid_lats)
-            depth_masked = np.ma.masked_where(self.depth_grid == 0, self.depth_grid)
+            # Plotar batimetria (grades muito grandes são amostradas para no
+            # máximo MAX_PLOT_POINTS por eixo: detalhe além disso não aparece na figura)
+            step_lat = max(1, -(-len(self.grid_lats) // self.MAX_PLOT_POINTS))
+            step_lon = max(1, -(-len(self.grid_lons) // self.MAX_PLOT_POINTS))
+            plot_lons = self.grid_lons[::step_lon]
+            plot_lats = self.grid_lats[::step_lat]
+            plot_depth = self.depth_grid[::step_lat, ::step_lon]
+            depth_masked = np.ma.masked_where(plot_depth == 0, plot_depth)
 
-            im = ax.pcolormesh(lon_mesh, lat_mesh, depth_masked,
-                               cmap=cmap_ocean, shading='auto', transform=ccrs.PlateCarree())
+            im = ax.pcolormesh(plot_lons, plot_lats, depth_masked,
+                               cmap=cmap_ocean, shading='auto', rasterized=True,
+                               transform=ccrs.PlateCarree())
             # Adicionar contornos de profundidade
-            if np.max(self.depth_grid) > 0:
-                contour_levels = np.linspace(0, np.max(self.depth_grid), 10)
-                cs = ax.contour(lon_mesh, lat_mesh, self.depth_grid,
+            if np.max(plot_depth) > 0:
+                contour_levels = np.linspace(0, np.max(plot_depth), 10)
+                cs = ax.contour(plot_lons, plot_lats, plot_depth,
                                 levels=contour_levels, colors='gray',
                                 alpha=0.3, linewidths=0.5, transform=ccrs.PlateCarree())
                 ax.clabel(cs, inline=True, fontsize=8, fmt='%d m')
@@ -601,17 +863,17 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
             ax.grid(True, alpha=0.3)
 
             # Barra de cores
-            cbar = plt.colorbar(im, ax=ax, label='Profundidade (m)')
+            cbar = fig.colorbar(im, ax=ax, label='Profundidade (m)')
 
-            plt.tight_layout()
+            fig.tight_layout()
 
             if output_file:
-                plt.savefig(output_file, dpi=300, bbox_inches='tight')
+                fig.savefig(output_file, dpi=300, bbox_inches='tight')
                 print(f"✓ Figura salva em: {output_file}")
             else:
                 plt.show()
+                plt.close(fig)
 
-            plt.close()
             return True
 
         except ImportError:
@@ -643,7 +905,7 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
         try:
             n_lats, n_lons = self.depth_grid.shape
             
-            with open(output_file, 'w') as f:
+            with open(output_file, 'w', buffering=self.WRITE_BUFFER_SIZE) as f:
                 # Escrever cabeçalho
                 f.write(f"# Grade batimétrica POM - Formato ASC Grid\n")
                 f.write(f"# Gerada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
@@ -656,13 +918,8 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
                 f.write(f"dy            {self.spacing_lat}\n")
                 f.write(f"NODATA_value  -9999\n")
                 
-                # Escrever dados (linha por linha)
-                for j in range(n_lats):
-                    row_values = []
-                    for i in range(n_lons):
-                        depth = self.depth_grid[j, i]
-                        row_values.append(f'{depth:10.3f}')
-                    f.write(' '.join(row_values) + '\n')
+                # Escrever dados (uma linha por latitude)
+                np.savetxt(f, self.depth_grid, fmt='%10.3f', delimiter=' ')
             
             print(f"✓ Arquivo ASC Grid salvo com sucesso!")
             print(f"  Dimensões: {n_lons} x {n_lats}")
@@ -678,8 +935,118 @@ Formato: i (col), j (row), longitude (°), latitude (°), profundidade (m)
             return False
     
     
+    def _grid_attributes(self):
+        """Atributos que identificam a grade gerada (usados para reaproveitá-la)."""
+        return {
+            'gebco_file': os.path.basename(self.gebco_file),
+            'gebco_mtime': os.path.getmtime(self.gebco_file),
+            'spacing_lon': self.spacing_lon,
+            'spacing_lat': self.spacing_lat,
+            'lon_min': self.lon_min,
+            'lon_max': self.lon_max,
+            'lat_min': self.lat_min,
+            'lat_max': self.lat_max,
+            'interpolation_method': self.interpolation_method,
+        }
+    
+    
+    def export_to_netcdf(self, output_file):
+        """
+        Salva a grade interpolada em NetCDF comprimido.
+        
+        Além de ser um formato binário prático para outras ferramentas (com
+        coordenadas CF, é georreferenciado diretamente por GDAL/QGIS), o
+        arquivo guarda os parâmetros da geração e pode ser reaproveitado com
+        load_from_netcdf() para evitar repetir a interpolação.
+        
+        Parameters:
+            output_file (str): Caminho para o arquivo de saída (.nc)
+        
+        Returns:
+            bool: True se a exportação foi bem-sucedida
+        """
+        if self.depth_grid is None:
+            print("ERRO: Dados interpolados não disponíveis. Execute interpolate_bathymetry() primeiro.")
+            return False
+        
+        print(f"\nExportando grade NetCDF para: {output_file}")
+        
+        try:
+            ds = xr.Dataset(
+                {'depth': (('lat', 'lon'), self.depth_grid.astype(np.float32, copy=False),
+                           {'units': 'm', 'long_name': 'Profundidade (positiva no oceano)'})},
+                coords={'lon': ('lon', self.grid_lons,
+                                {'units': 'degrees_east', 'standard_name': 'longitude'}),
+                        'lat': ('lat', self.grid_lats,
+                                {'units': 'degrees_north', 'standard_name': 'latitude'})},
+                attrs={**self._grid_attributes(),
+                       'Conventions': 'CF-1.8',
+                       'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+            )
+            ds.to_netcdf(output_file, encoding={'depth': {'zlib': True, 'complevel': 1}})
+            
+            print(f"✓ Arquivo NetCDF salvo com sucesso!")
+            print(f"  Tamanho: {os.path.getsize(output_file) / 1024:.1f} KB")
+            
+            return True
+            
+        except Exception as e:
+            print(f"ERRO ao exportar NetCDF: {e}")
+            return False
+    
+    
+    def load_from_netcdf(self, input_file, method='linear'):
+        """
+        Reaproveita uma grade salva por export_to_netcdf().
+        
+        A grade só é carregada se foi gerada com a mesma extensão, espaçamento,
+        método de interpolação e arquivo GEBCO (mesma data de modificação).
+        Requer define_grid_extent() já executado.
+        
+        Parameters:
+            input_file (str): Caminho para o arquivo NetCDF
+            method (str): Método de interpolação esperado
+        
+        Returns:
+            bool: True se a grade foi reaproveitada
+        """
+        if self.grid_lons is None or self.grid_lats is None:
+            print("ERRO: Grade não definida. Execute define_grid_extent() primeiro.")
+            return False
+        
+        if not os.path.exists(input_file):
+            return False
+        
+        try:
+            with xr.open_dataset(input_file) as ds:
+                expected = self._grid_attributes()
+                expected['interpolation_method'] = method
+                
+                for key, value in expected.items():
+                    if ds.attrs.get(key) != value:
+                        print(f"  Grade salva em {os.path.basename(input_file)} não corresponde "
+                              f"à configuração atual ({key}); será regenerada")
+                        return False
+                
+                if not (np.array_equal(ds['lon'].values, self.grid_lons) and
+                        np.array_equal(ds['lat'].values, self.grid_lats)):
+                    print(f"  Coordenadas de {os.path.basename(input_file)} diferem; grade será regenerada")
+                    return False
+                
+                self.depth_grid = ds['depth'].values
+        
+        except Exception as e:
+            print(f"  Não foi possível reaproveitar {input_file}: {e}")
+            return False
+        
+        self.interpolation_method = method
+        print(f"\n✓ Grade interpolada reaproveitada de: {input_file}")
+        return True
+    
+    
     def cleanup(self):
-        """Fecha o arquivo NetCDF e libera memória."""
-        if self.gebco_data is not None:
+        """Fecha o arquivo NetCDF (se aberto por este gerador) e libera memória."""
+        if self.gebco_data is not None and self._owns_gebco_data:
             self.gebco_data.close()
             print("\nArquivo GEBCO fechado.")
+        self.gebco_data = None
@@ -25,10 +25,16 @@ Data: Dezembro 2025
 import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.colors import LinearSegmentedColormap
+from matplotlib.artist import Artist
 import sys
 import os
 import argparse
 
+# Adicionar src ao path (funções compartilhadas com o editor)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from grid_utils import axis_from_indices, plot_cells
+
 
 def load_grid(grid_file):
     """
@@ -43,51 +49,41 @@ def load_grid(grid_file):
     if not os.path.exists(grid_file):
         raise FileNotFoundError(f"Arquivo não encontrado: {grid_file}")
     
-    # Ler arquivo
+    # Ler arquivo: cabeçalho linha a linha (só o início do arquivo) e
+    # dados de uma vez com o parser em C do NumPy
     header_lines = []
-    data_lines = []
     
     with open(grid_file, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if line.startswith('#') or not line:
-                header_lines.append(line)
+        while True:
+            pos = f.tell()
+            line = f.readline()
+            if line and (line.strip().startswith('#') or not line.strip()):
+                header_lines.append(line.strip())
             else:
-                data_lines.append(line)
+                break
+        f.seek(pos)
+        data = np.loadtxt(f, comments='#', usecols=(0, 1, 2, 3, 4), ndmin=2)
     
     print(f"✓ {len(header_lines)} linhas de cabeçalho")
-    print(f"✓ {len(data_lines)} linhas de dados")
-    
-    # Parse dos dados
-    data = []
-    for line in data_lines:
-        parts = line.split()
-        if len(parts) >= 5:
-            i, j, lon, lat, depth = map(float, parts[:5])
-            data.append([int(i), int(j), lon, lat, depth])
-    
-    data = np.array(data)
+    print(f"✓ {len(data)} linhas de dados")
     
     # Extrair informações
     indices_i = data[:, 0].astype(int)
     indices_j = data[:, 1].astype(int)
     lon_data = data[:, 2]
     lat_data = data[:, 3]
-    depth_data = data[:, 4]
-    
-    # Reconstruir grade 2D
-    lons = np.unique(lon_data)
-    lats = np.unique(lat_data)
+    depth_data = data[:, 4].astype(np.float32)
     
-    ni = len(lons)
-    nj = len(lats)
+    # Reconstruir grade 2D: eixos pelos índices do arquivo, na mesma ordem
+    # das colunas/linhas de depth
+    lons, pos_i = axis_from_indices(indices_i, lon_data)
+    lats, pos_j = axis_from_indices(indices_j, lat_data)
+    ni, nj = len(lons), len(lats)
     
-    # Criar grade 2D: [lat, lon] = [nj, ni]
-    depth = np.zeros((nj, ni))
-    for idx in range(len(data)):
-        i = indices_i[idx] - 1  # Converter para índice 0-based
-        j = indices_j[idx] - 1
-        depth[j, i] = depth_data[idx]
+    # Criar grade 2D: [lat, lon] = [nj, ni], em float32 (precisão de
+    # centímetros, metade da memória)
+    depth = np.zeros((nj, ni), dtype=np.float32)
+    depth[pos_j, pos_i] = depth_data
     
     print(f"✓ Grade: {ni} x {nj} pontos")
     print(f"✓ Extensão lon: [{lons.min():.2f}, {lons.max():.2f}]")
@@ -97,7 +93,7 @@ def load_grid(grid_file):
     return lons, lats, depth, header_lines
 
 
-def plot_grid(lons, lats, depth, output_file=None, dpi=300):
+def plot_grid(lons, lats, depth, output_file=None, dpi=300, fig=None):
     """
     Cria visualização da grade batimétrica.
     
@@ -107,20 +103,30 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
         depth (array): Grade 2D de profundidades [nj, ni]
         output_file (str): Caminho para salvar (None = mostrar)
         dpi (int): DPI da figura salva
+        fig (Figure): Figura a reaproveitar, ex: ao salvar várias grades em
+                      lote (é limpa e não é fechada); None = criar uma nova
     """
     print("\nGerando visualização...")
     
     import cartopy.crs as ccrs
     import cartopy.feature as cfeature
     
-    # Criar figura com Cartopy
+    # Criar figura com Cartopy (layout 'constrained': ajustado no próprio
+    # desenho, sem uma passada extra de tight_layout; set_layout_engine só
+    # existe a partir do Matplotlib 3.6)
     proj = ccrs.PlateCarree()
-    fig, ax = plt.subplots(figsize=(14, 10), subplot_kw={'projection': proj})
+    own_figure = fig is None
+    if own_figure:
+        fig = plt.figure(figsize=(14, 10), constrained_layout=True)
+    else:
+        fig.clear()
+        if hasattr(fig, 'set_layout_engine'):
+            fig.set_layout_engine('constrained')
+        else:
+            fig.set_constrained_layout(True)
+    ax = fig.add_subplot(projection=proj)
     ax.set_extent([lons.min(), lons.max(), lats.min(), lats.max()], crs=proj)
     
-    # Preparar dados
-    lon_mesh, lat_mesh = np.meshgrid(lons, lats)
-    
     # Criar máscaras separadas para terra e oceano
     land_mask = depth == 0  # Terra (depth = 0)
     ocean_mask = depth > 0  # Oceano (depth > 0)
@@ -128,9 +134,8 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
     # Pintar terra em cinza (direto da grade, não do cfeature.LAND)
     print("✓ Pintando células de terra da grade em cinza")
     land_depth = np.ma.masked_where(~land_mask, depth)
-    ax.pcolormesh(lon_mesh, lat_mesh, land_depth,
-                 cmap='Greys', vmin=-1, vmax=1,
-                 transform=ccrs.PlateCarree(), zorder=2)
+    plot_cells(ax, lons, lats, land_depth, ccrs.PlateCarree(),
+               cmap='Greys', vmin=-1, vmax=1, zorder=2)
     
     # Preparar dados de oceano
     depth_masked = np.ma.masked_where(~ocean_mask, depth)
@@ -141,9 +146,8 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
     
     # Plotar batimetria do oceano
     print("✓ Pintando células de oceano com escala de profundidade")
-    im = ax.pcolormesh(lon_mesh, lat_mesh, depth_masked,
-                      cmap=cmap_ocean, shading='auto',
-                      transform=ccrs.PlateCarree(), zorder=3)
+    im = plot_cells(ax, lons, lats, depth_masked, ccrs.PlateCarree(),
+                    cmap=cmap_ocean, zorder=3)
     
     # Adicionar linha de costa real e bordas
     print("✓ Adicionando linha de costa real (Cartopy/Natural Earth)")
@@ -151,16 +155,25 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
     ax.add_feature(cfeature.BORDERS, edgecolor='darkred', linewidth=0.5, 
                   linestyle='--', alpha=0.5, zorder=5)
     
-    # Contornos batimétricos
-    if np.max(depth) > 0:
-        levels = [500, 1000, 2000, 3000, 4000, 5000, 6000]
-        levels = [l for l in levels if l < np.max(depth)]
+    # Contornos batimétricos (profundidade máxima calculada uma única vez)
+    max_depth = float(depth.max())
+    if max_depth > 0:
+        levels = np.array([500, 1000, 2000, 3000, 4000, 5000, 6000])
+        levels = levels[levels < max_depth].tolist()
         
-        cs = ax.contour(lon_mesh, lat_mesh, depth,
+        cs = ax.contour(lons, lats, depth,
                       levels=levels, colors='gray', linewidths=0.5,
                       alpha=0.3, transform=ccrs.PlateCarree(), zorder=4)
         
         ax.clabel(cs, inline=True, fontsize=8, fmt='%d m')
+        
+        # Linhas de contorno rasterizadas (rótulos e eixos continuam vetoriais)
+        if isinstance(cs, Artist):
+            cs.set_rasterized(True)
+        else:
+            # matplotlib < 3.8: uma coleção por nível
+            for collection in cs.collections:
+                collection.set_rasterized(True)
         print(f"✓ Contornos: {levels}")
     
     # Formatação
@@ -183,16 +196,14 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
     gl.right_labels = False
     
     # Colorbar
-    cbar = plt.colorbar(im, ax=ax, label='Profundidade (m)',
-                       fraction=0.046, pad=0.04)
-    
-    plt.tight_layout()
+    cbar = fig.colorbar(im, ax=ax, label='Profundidade (m)',
+                        fraction=0.046, pad=0.04)
     
     # Salvar ou mostrar
     if output_file:
         print(f"Salvando figura em: {output_file}")
         try:
-            plt.savefig(output_file, dpi=dpi, bbox_inches='tight')
+            fig.savefig(output_file, dpi=dpi, bbox_inches='tight')
             print(f"✓ Figura salva com sucesso!")
             # Verificar tamanho do arquivo
             import os
@@ -203,7 +214,8 @@ def plot_grid(lons, lats, depth, output_file=None, dpi=300):
             print(f"❌ Erro ao salvar: {e}")
             raise
         finally:
-            plt.close()
+            if own_figure:
+                plt.close(fig)
     else:
         print("\n✓ Abrindo janela de visualização...")
         print("  Feche a janela para continuar")
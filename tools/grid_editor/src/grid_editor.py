@@ -46,12 +46,83 @@ import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
 from matplotlib.collections import LineCollection
+from matplotlib.artist import Artist
+from matplotlib.image import AxesImage
 import sys
 import os
 from datetime import datetime
 import argparse
+import hashlib
+import pickle
+import copy
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
+from shapely.geometry import box
+
+from grid_utils import axis_from_indices, plot_cells
+
+
+# Cache em disco das geometrias Natural Earth já recortadas para a região e
+# das grades convertidas, dentro do projeto (.cache/ na raiz, ignorado pelo git)
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+CACHE_DIR = os.path.join(PROJECT_ROOT, '.cache', 'grid_editor')
+
+
+def cached_feature(feature, extent):
+    """
+    Recorta as geometrias de uma feature Natural Earth para a região e guarda
+    o resultado em cache no disco.
+    
+    Ler o shapefile e testar cada geometria contra a região é a etapa mais
+    lenta da abertura do editor; nas execuções seguintes com a mesma região
+    basta carregar a lista já recortada.
+    
+    Parameters:
+        feature: Feature do Cartopy (ex: cfeature.COASTLINE)
+        extent (list): [lon_min, lon_max, lat_min, lat_max] a recortar
+    
+    Returns:
+        Feature: ShapelyFeature com as geometrias recortadas, ou a própria
+                 feature se ela não for Natural Earth ou a região cruzar ±180°
+    """
+    if not isinstance(feature, cfeature.NaturalEarthFeature):
+        return feature
+    lon_min, lon_max, lat_min, lat_max = extent
+    if lon_min < -180 or lon_max > 180:
+        return feature
+    
+    # Escala fixa conforme o tamanho da região (como o AdaptiveScaler faria),
+    # calculada numa cópia: scale_from_extent altera o estado do scaler, que é
+    # compartilhado por todos os usos de cfeature.COASTLINE etc.
+    scale = copy.copy(feature.scaler).scale_from_extent(extent)
+    key = f"{feature.category}/{feature.name}/{scale}/" + \
+          "/".join(f"{v:.4f}" for v in extent)
+    cache_file = os.path.join(
+        CACHE_DIR,
+        f"{feature.name}_{scale}_{hashlib.md5(key.encode()).hexdigest()}.pkl")
+    
+    geoms = None
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, 'rb') as f:
+                geoms = pickle.load(f)
+        except Exception as e:
+            print(f"⚠ Cache de geometrias inválido ({e}), recriando...")
+    
+    if geoms is None:
+        region = box(lon_min, lat_min, lon_max, lat_max)
+        geoms = [geom.intersection(region)
+                 for geom in feature.with_scale(scale).geometries()
+                 if geom.intersects(region)]
+        geoms = [geom for geom in geoms if not geom.is_empty]
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(cache_file, 'wb') as f:
+                pickle.dump(geoms, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            print(f"⚠ Não foi possível gravar o cache de geometrias: {e}")
+    
+    return cfeature.ShapelyFeature(geoms, ccrs.PlateCarree(), **feature.kwargs)
 
 
 class GridEditor:
@@ -59,16 +130,29 @@ class GridEditor:
     Editor interativo de grades com interface gráfica avançada.
     """
     
-    def __init__(self, grid_file, show_contours=True):
+    # Máximo de células exibidas por eixo: grades maiores são mostradas
+    # subamostradas (a tela não tem resolução para mais que isso)
+    MAX_DISPLAY_CELLS = 2000
+    
+    # Versão do formato do cache .npz: caches de outra versão são refeitos
+    CACHE_VERSION = 3
+    
+    def __init__(self, grid_file, show_contours=True, use_cache=False):
         """
         Inicializa o editor.
         
         Parameters:
             grid_file (str): Caminho para o arquivo ASCII da grade
             show_contours (bool): Mostrar contornos batimétricos
+            use_cache (bool): Guardar/reaproveitar a grade convertida em
+                              .npz no diretório de cache do projeto
         """
         self.grid_file = grid_file
         self.backup_file = grid_file.replace('.asc', '_backup.asc')
+        self.use_cache = use_cache
+        # Um cache por arquivo de grade, identificado pelo caminho absoluto
+        grid_key = hashlib.md5(os.path.abspath(grid_file).encode()).hexdigest()
+        self.cache_file = os.path.join(CACHE_DIR, f"grid_{grid_key}.npz")
         self.modified = False
         self.enable_contours = show_contours
         
@@ -112,65 +196,69 @@ class GridEditor:
         """
         Carrega a grade do arquivo ASCII formato POM (5 colunas).
         Formato: i j lon lat depth
+        
+        Com use_cache, a primeira leitura grava a grade convertida em .npz
+        no diretório de cache do projeto; nas seguintes, se tamanho e data de
+        modificação do ASCII forem os registrados no cache, a grade é lida
+        dele sem reprocessar o texto.
         """
         print(f"\nCarregando grade de: {self.grid_file}")
         
         if not os.path.exists(self.grid_file):
             raise FileNotFoundError(f"Arquivo não encontrado: {self.grid_file}")
         
-        # Fazer backup se não existe
+        # Fazer backup se não existe. Sempre uma cópia: um link físico
+        # compartilharia o conteúdo com a grade, e regenerá-la no mesmo
+        # arquivo alteraria também o backup. Backups que ainda sejam links
+        # para a grade (criados por versões anteriores) são refeitos como cópia
+        if os.path.exists(self.backup_file) and os.path.samefile(self.backup_file, self.grid_file):
+            os.remove(self.backup_file)
         if not os.path.exists(self.backup_file):
             import shutil
             shutil.copy2(self.grid_file, self.backup_file)
             print(f"Backup criado: {self.backup_file}")
         
-        # Ler arquivo
-        header_lines = []
-        data_lines = []
+        # Grade já convertida em execução anterior (ASCII inalterado desde
+        # então): pula a leitura do ASCII
+        if not (self.use_cache and self.load_cache()):
+            # Ler arquivo: cabeçalho linha a linha (só o início do arquivo) e
+            # dados de uma vez com o parser em C do NumPy
+            header_lines = []
+            
+            with open(self.grid_file, 'r') as f:
+                while True:
+                    pos = f.tell()
+                    line = f.readline()
+                    if line and (line.strip().startswith('#') or not line.strip()):
+                        header_lines.append(line.strip())
+                    else:
+                        break
+                f.seek(pos)
+                data = np.loadtxt(f, comments='#', usecols=(0, 1, 2, 3, 4), ndmin=2)
+            
+            self.header = header_lines
+            print(f"✓ {len(header_lines)} linhas de cabeçalho")
+            print(f"✓ {len(data)} linhas de dados")
+            
+            # Reconstruir grade 2D: eixos pelos índices do arquivo, na mesma
+            # ordem das colunas/linhas de depth
+            self.lons, pos_i = axis_from_indices(data[:, 0].astype(int), data[:, 2])
+            self.lats, pos_j = axis_from_indices(data[:, 1].astype(int), data[:, 3])
+            
+            # Criar grade 2D corretamente: [lat, lon] = [nj, ni]
+            # depth[j, i] porque j é índice de latitude e i de longitude.
+            # float32 basta para profundidades com precisão de centímetros e
+            # reduz a memória à metade
+            self.depth = np.zeros((len(self.lats), len(self.lons)), dtype=np.float32)
+            self.depth[pos_j, pos_i] = data[:, 4]
+            
+            if self.use_cache:
+                self.save_cache()
+        
+        nj, ni = self.depth.shape
         
-        with open(self.grid_file, 'r') as f:
-            for line in f:
-                line = line.strip()
-                if line.startswith('#') or not line:
-                    header_lines.append(line)
-                else:
-                    data_lines.append(line)
-        
-        self.header = header_lines
-        print(f"✓ {len(header_lines)} linhas de cabeçalho")
-        print(f"✓ {len(data_lines)} linhas de dados")
-        
-        # Parse dos dados
-        data = []
-        for line in data_lines:
-            parts = line.split()
-            if len(parts) >= 5:
-                i, j, lon, lat, depth = map(float, parts[:5])
-                data.append([int(i), int(j), lon, lat, depth])
-        
-        data = np.array(data)
-        
-        # Extrair informações
-        self.indices_i = data[:, 0].astype(int)
-        self.indices_j = data[:, 1].astype(int)
-        self.lon_data = data[:, 2]
-        self.lat_data = data[:, 3]
-        self.depth_data = data[:, 4]
-        
-        # Reconstruir grade 2D
-        ni = len(np.unique(self.indices_i))
-        nj = len(np.unique(self.indices_j))
-        
-        self.lons = np.unique(self.lon_data)
-        self.lats = np.unique(self.lat_data)
-        
-        # Criar grade 2D corretamente: [lat, lon] = [nj, ni]
-        self.depth = np.zeros((nj, ni))
-        for idx in range(len(data)):
-            i = self.indices_i[idx] - 1  # Converter para índice 0-based
-            j = self.indices_j[idx] - 1
-            # depth[j, i] porque j é índice de latitude e i de longitude
-            self.depth[j, i] = self.depth_data[idx]
+        # Máscara de terra (depth == 0), mantida em dia por toggle_cell
+        self.land_mask = self.depth == 0
         
         # Calcular espaçamento
         self.cellsize_lon = np.diff(self.lons).mean() if len(self.lons) > 1 else 0.25
@@ -184,6 +272,53 @@ class GridEditor:
         print(f"✓ Espaçamento: dx={self.cellsize_lon:.4f}°, dy={self.cellsize_lat:.4f}°")
         print(f"✓ Profundidade: [{self.depth.min():.1f}, {self.depth.max():.1f}] m")
     
+    def load_cache(self):
+        """
+        Carrega a grade do cache .npz, se existir e tiver sido gerado a
+        partir do arquivo ASCII atual (mesmo tamanho e data de modificação).
+        
+        Returns:
+            bool: True se a grade foi carregada do cache
+        """
+        if not os.path.exists(self.cache_file):
+            return False
+        
+        stat = os.stat(self.grid_file)
+        try:
+            with np.load(self.cache_file) as cache:
+                if (int(cache.get('version', 0)) != self.CACHE_VERSION or
+                        str(cache['source']) != os.path.abspath(self.grid_file) or
+                        int(cache['size']) != stat.st_size or
+                        int(cache['mtime_ns']) != stat.st_mtime_ns):
+                    return False
+                self.lons = cache['lons']
+                self.lats = cache['lats']
+                self.depth = cache['depth']
+                self.header = [str(line) for line in cache['header']]
+        except Exception as e:
+            print(f"⚠ Cache inválido ({e}), lendo o arquivo ASCII")
+            return False
+        
+        print(f"✓ Grade lida do cache: {self.cache_file}")
+        return True
+    
+    def save_cache(self):
+        """
+        Salva eixos, profundidade e cabeçalho em .npz no diretório de cache,
+        com tamanho e data de modificação do ASCII para validar o reuso.
+        """
+        stat = os.stat(self.grid_file)
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            with open(self.cache_file, 'wb') as f:
+                np.savez(f, version=self.CACHE_VERSION,
+                         source=os.path.abspath(self.grid_file),
+                         size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+                         lons=self.lons, lats=self.lats, depth=self.depth,
+                         header=np.array(self.header, dtype=str))
+        except OSError as e:
+            print(f"⚠ Não foi possível gravar o cache da grade: {e}")
+    
     def setup_figure(self):
         """
         Configura a figura matplotlib com cartopy.
@@ -206,25 +341,30 @@ class GridEditor:
     
     def update_plot(self):
         """
-        Atualiza o plot com os dados atuais.
+        Desenha o mapa completo com os dados atuais.
+        
+        Usado na criação da figura. Alternar camadas, zoom e salvar apenas
+        ajustam os artistas já existentes (ver set_layer_visible e
+        refresh_bathymetry_contours), sem recriar linha de costa e grade.
         """
         self.ax.clear()
+        self.coastline_artists = None
+        self.grid_artists = None
+        self.contour_set = None
+        self.contour_labels = []
+        self.contours_stale = False
         
         # Definir extensão do mapa
         self.ax.set_extent([self.lons.min(), self.lons.max(), 
                            self.lats.min(), self.lats.max()], crs=self.projection)
         
-        # Preparar dados para visualização usando meshgrid como no bathymetry_generator
-        lon_mesh, lat_mesh = np.meshgrid(self.lons, self.lats)
-        
-        # Mascarar oceano (depth == 0 é terra)
-        depth_masked = np.ma.masked_where(self.depth == 0, self.depth)
+        # Mascarar terra (depth == 0) com a máscara já calculada, sem copiar
+        depth_masked = np.ma.array(self.depth, mask=self.land_mask, copy=False)
         
         # Plot batimetria (apenas oceano)
-        im = self.ax.pcolormesh(lon_mesh, lat_mesh, depth_masked,
-                               cmap='Blues_r', shading='auto',
-                               vmin=0, vmax=6000,
-                               transform=self.projection)
+        im = self.plot_cells(depth_masked, cmap='Blues_r', vmin=0, vmax=6000)
+        self.mesh = im
+        self.display_window = None
         
         # Contornos batimétricos
         if self.show_bathy_contours and self.enable_contours:
@@ -246,12 +386,36 @@ class GridEditor:
         # Labels e título
         self.ax.set_xlabel('Longitude (°)', fontsize=12)
         self.ax.set_ylabel('Latitude (°)', fontsize=12)
-        title = 'Editor de Grade Oceânica'
-        if self.modified:
-            title += ' [MODIFICADO - Pressione \'s\' para salvar]'
-        self.ax.set_title(title, fontsize=14, fontweight='bold')
+        self.update_title()
         
         # Manter zoom se existir
+        self.apply_view_limits()
+        self.update_display()
+        
+        # Grid com labels
+        gl = self.ax.gridlines(draw_labels=True, alpha=0.3, linestyle='--', linewidth=0.5)
+        gl.top_labels = False
+        gl.right_labels = False
+        
+        self.fig.canvas.draw()
+    
+    def plot_cells(self, data, **kwargs):
+        """
+        Desenha valores por célula da grade (ver plot_cells).
+        
+        Parameters:
+            data (array): Valores [nj, ni] (pode ser mascarado)
+            **kwargs: cmap, vmin, vmax, zorder etc.
+        
+        Returns:
+            Artista criado (AxesImage ou QuadMesh)
+        """
+        return plot_cells(self.ax, self.lons, self.lats, data, self.projection, **kwargs)
+    
+    def apply_view_limits(self):
+        """
+        Aplica o zoom atual ou, se não houver, a extensão da grade com margem.
+        """
         if self.current_xlim is not None:
             self.ax.set_xlim(self.current_xlim)
             self.ax.set_ylim(self.current_ylim)
@@ -261,23 +425,176 @@ class GridEditor:
             margin_lat = (self.lats.max() - self.lats.min()) * 0.05
             self.ax.set_xlim(self.lons.min() - margin_lon, self.lons.max() + margin_lon)
             self.ax.set_ylim(self.lats.min() - margin_lat, self.lats.max() + margin_lat)
+    
+    def update_display(self):
+        """
+        Ajusta a resolução das células exibidas à região visível.
         
-        # Grid com labels
-        gl = self.ax.gridlines(draw_labels=True, alpha=0.3, linestyle='--', linewidth=0.5)
-        gl.top_labels = False
-        gl.right_labels = False
+        Grades com mais de MAX_DISPLAY_CELLS pontos em algum eixo são
+        exibidas subamostradas (um ponto a cada `step`) e apenas na janela
+        visível; a janela é recalculada a cada zoom/pan, chegando à
+        resolução completa ao aproximar. self.depth continua completo para
+        edição e gravação. Vale apenas para a imagem (grade uniforme).
+        """
+        nj, ni = self.depth.shape
+        if not isinstance(self.mesh, AxesImage) or max(nj, ni) <= self.MAX_DISPLAY_CELLS:
+            return
         
-        self.fig.canvas.draw()
+        # Janela de índices visível (com uma célula de folga em cada lado)
+        xlim = self.ax.get_xlim()
+        ylim = self.ax.get_ylim()
+        i0 = max(int(np.searchsorted(self.lons, min(xlim))) - 1, 0)
+        i1 = min(int(np.searchsorted(self.lons, max(xlim))) + 1, ni)
+        j0 = max(int(np.searchsorted(self.lats, min(ylim))) - 1, 0)
+        j1 = min(int(np.searchsorted(self.lats, max(ylim))) + 1, nj)
+        if i1 <= i0 or j1 <= j0:
+            return  # vista fora da grade
+        
+        step = max(1, -(-max(i1 - i0, j1 - j0) // self.MAX_DISPLAY_CELLS))
+        window = (j0, j1, i0, i1, step)
+        if window == self.display_window:
+            return
+        
+        rows = slice(j0, j1, step)
+        cols = slice(i0, i1, step)
+        data = np.ma.array(self.depth[rows, cols], mask=self.land_mask[rows, cols])
+        
+        # Cada pixel exibido cobre `step` células a partir do ponto amostrado
+        nj_display, ni_display = data.shape
+        left = self.lons[i0] - self.cellsize_lon / 2
+        bottom = self.lats[j0] - self.cellsize_lat / 2
+        self.mesh.set_data(data)
+        self.mesh.set_extent([left, left + ni_display * step * self.cellsize_lon,
+                              bottom, bottom + nj_display * step * self.cellsize_lat])
+        self.display_window = window
+    
+    def set_layer_visible(self, layer, visible):
+        """
+        Mostra ou oculta uma camada sem redesenhar o mapa inteiro.
+        
+        Os artistas da camada são criados na primeira vez em que ela é
+        exibida e, depois disso, apenas alternados com set_visible().
+        
+        Parameters:
+            layer (str): 'grid' ou 'coastline'
+            visible (bool): Se a camada deve ser exibida
+        """
+        artists = getattr(self, f'{layer}_artists')
+        
+        if artists is None:
+            if visible:
+                if layer == 'grid':
+                    self.draw_grid()
+                else:
+                    self.draw_cartopy_coastline()
+        else:
+            for artist in artists:
+                artist.set_visible(visible)
+        
+        self.fig.canvas.draw_idle()
+    
+    def refresh_bathymetry_contours(self):
+        """
+        Atualiza os contornos batimétricos conforme o estado atual.
+        
+        Se a profundidade não mudou desde o último cálculo, apenas mostra ou
+        oculta os contornos existentes; após edições (contours_stale), remove
+        e recalcula-os a partir da profundidade atual.
+        """
+        visible = self.show_bathy_contours and self.enable_contours
+        
+        if self.contour_set is not None and not self.contours_stale:
+            self.contour_set.set_visible(visible)
+            for text in self.contour_labels:
+                text.set_visible(visible)
+            self.fig.canvas.draw_idle()
+            return
+        
+        if self.contour_set is not None:
+            if isinstance(self.contour_set, Artist):
+                # matplotlib >= 3.8: remove também os rótulos
+                self.contour_set.remove()
+            else:
+                for collection in self.contour_set.collections:
+                    collection.remove()
+                for text in self.contour_set.labelTexts:
+                    text.remove()
+            self.contour_set = None
+            self.contour_labels = []
+        
+        if visible:
+            self.draw_bathymetry_contours()
+        
+        self.fig.canvas.draw_idle()
+    
+    def update_title(self):
+        """
+        Atualiza o título indicando se há modificações não salvas.
+        """
+        title = 'Editor de Grade Oceânica'
+        if self.modified:
+            title += ' [MODIFICADO - Pressione \'s\' para salvar]'
+        self.ax.set_title(title, fontsize=14, fontweight='bold')
+    
+    def update_cell(self, j, i):
+        """
+        Atualiza apenas a célula alterada no mapa, sem redesenho completo.
+        
+        Edita o valor da célula diretamente no QuadMesh existente em vez de
+        limpar o eixo e recriar linha de costa, contornos e grade. Os
+        contornos batimétricos são recalculados ao salvar ou ao reativá-los
+        (refresh_bathymetry_contours).
+        
+        Parameters:
+            j, i: Índices da célula (j=lat, i=lon)
+        """
+        data = self.mesh.get_array()
+        value = np.ma.masked if self.land_mask[j, i] else self.depth[j, i]
+        
+        if self.display_window is not None:
+            # Exibição subamostrada: só muda se a célula for um ponto exibido
+            j0, j1, i0, i1, step = self.display_window
+            if (j0 <= j < j1 and i0 <= i < i1
+                    and (j - j0) % step == 0 and (i - i0) % step == 0):
+                data[(j - j0) // step, (i - i0) // step] = value
+        elif data.ndim == 2:
+            data[j, i] = value
+        else:
+            # Versões antigas do matplotlib guardam o array achatado
+            data[j * self.depth.shape[1] + i] = value
+        
+        self.mesh.set_array(data)
+        self.update_title()
+        self.fig.canvas.draw_idle()
     
     def draw_cartopy_coastline(self):
         """
         Desenha linha de costa real usando Cartopy.
-        """
-        # Adicionar features do cartopy
-        self.ax.add_feature(cfeature.LAND, facecolor='lightgray', zorder=3)
-        self.ax.add_feature(cfeature.COASTLINE, edgecolor='red', linewidth=2, zorder=5)
-        self.ax.add_feature(cfeature.BORDERS, edgecolor='darkred', linewidth=0.5, 
-                          linestyle='--', alpha=0.5, zorder=5)
+        
+        As geometrias são recortadas para a região da grade (com uma margem
+        de uma extensão da grade para cada lado, para zoom out e pan) e
+        reaproveitadas do cache em disco nas próximas aberturas.
+        """
+        lon_min, lon_max = float(self.lons.min()), float(self.lons.max())
+        lat_min, lat_max = float(self.lats.min()), float(self.lats.max())
+        margin_lon = lon_max - lon_min
+        margin_lat = lat_max - lat_min
+        extent = [lon_min - margin_lon, lon_max + margin_lon,
+                  max(lat_min - margin_lat, -90.0), min(lat_max + margin_lat, 90.0)]
+        if lon_min >= -180 and lon_max <= 180:
+            extent[0] = max(extent[0], -180.0)
+            extent[1] = min(extent[1], 180.0)
+        
+        # Adicionar features do cartopy (guardadas para alternar visibilidade)
+        self.coastline_artists = [
+            self.ax.add_feature(cached_feature(cfeature.LAND, extent),
+                                facecolor='lightgray', zorder=3),
+            self.ax.add_feature(cached_feature(cfeature.COASTLINE, extent),
+                                edgecolor='red', linewidth=2, zorder=5),
+            self.ax.add_feature(cached_feature(cfeature.BORDERS, extent),
+                                edgecolor='darkred', linewidth=0.5,
+                                linestyle='--', alpha=0.5, zorder=5),
+        ]
     
     def draw_bathymetry_contours(self):
         """
@@ -286,35 +603,36 @@ class GridEditor:
         # Contornos a cada 1000m até 6000m
         levels = [500, 1000, 2000, 3000, 4000, 5000, 6000]
         
-        lon_mesh, lat_mesh = np.meshgrid(self.lons, self.lats)
-        cs = self.ax.contour(lon_mesh, lat_mesh, self.depth,
+        cs = self.ax.contour(self.lons, self.lats, self.depth,
                            levels=levels, colors='gray', linewidths=0.5,
                            alpha=0.3, transform=self.projection, zorder=4)
         
         # Labels nos contornos
-        self.ax.clabel(cs, inline=True, fontsize=8, fmt='%d m')
+        self.contour_labels = self.ax.clabel(cs, inline=True, fontsize=8, fmt='%d m')
+        self.contour_set = cs
+        self.contours_stale = False
     
     def draw_grid(self):
         """
         Desenha a grade de células do modelo.
         """
-        # Criar linhas verticais e horizontais
-        lines_v = [[(lon, self.lats[0]), (lon, self.lats[-1])] 
-                   for lon in self.lons]
-        lines_h = [[(self.lons[0], lat), (self.lons[-1], lat)] 
-                   for lat in self.lats]
-        
-        # Adicionar bordas
-        lines_v.append([(self.lons[-1] + self.cellsize_lon, self.lats[0]), 
-                        (self.lons[-1] + self.cellsize_lon, self.lats[-1])])
-        lines_h.append([(self.lons[0], self.lats[-1] + self.cellsize_lat), 
-                        (self.lons[-1], self.lats[-1] + self.cellsize_lat)])
-        
-        lc_v = LineCollection(lines_v, colors='gray', linewidths=0.3, alpha=0.6, zorder=6)
-        lc_h = LineCollection(lines_h, colors='gray', linewidths=0.3, alpha=0.6, zorder=6)
-        
-        self.ax.add_collection(lc_v)
-        self.ax.add_collection(lc_h)
+        # Segmentos verticais (um por longitude) e horizontais (um por
+        # latitude), incluindo as bordas, num único array (N, 2, 2)
+        x_v = np.append(self.lons, self.lons[-1] + self.cellsize_lon)
+        y_h = np.append(self.lats, self.lats[-1] + self.cellsize_lat)
+        n_v = len(x_v)
+        
+        segments = np.empty((n_v + len(y_h), 2, 2))
+        segments[:n_v, :, 0] = x_v[:, np.newaxis]
+        segments[:n_v, 0, 1] = self.lats[0]
+        segments[:n_v, 1, 1] = self.lats[-1]
+        segments[n_v:, 0, 0] = self.lons[0]
+        segments[n_v:, 1, 0] = self.lons[-1]
+        segments[n_v:, :, 1] = y_h[:, np.newaxis]
+        
+        lc = LineCollection(segments, colors='gray', linewidths=0.3, alpha=0.6, zorder=6)
+        self.ax.add_collection(lc)
+        self.grid_artists = [lc]
     
     def find_nearest_cell(self, lon, lat):
         """
@@ -399,8 +717,10 @@ class GridEditor:
             self.depth[j, i] = 0.0
             print(f"✓ Agora é terra (depth = 0)")
         
+        self.land_mask[j, i] = self.depth[j, i] == 0
         self.modified = True
-        self.update_plot()
+        self.contours_stale = True
+        self.update_cell(j, i)
     
     def on_click(self, event):
         """
@@ -460,6 +780,7 @@ class GridEditor:
         
         self.ax.set_xlim(self.current_xlim)
         self.ax.set_ylim(self.current_ylim)
+        self.update_display()
         self.fig.canvas.draw_idle()
         
         # Atualizar posição inicial para movimento contínuo
@@ -483,25 +804,27 @@ class GridEditor:
             # Reset zoom
             self.current_xlim = None
             self.current_ylim = None
-            self.update_plot()
+            self.apply_view_limits()
+            self.update_display()
+            self.fig.canvas.draw_idle()
             print("Zoom resetado")
         
         elif event.key == 'g':
             # Toggle grade
             self.show_grid = not self.show_grid
-            self.update_plot()
+            self.set_layer_visible('grid', self.show_grid)
             print(f"Grade: {'ON' if self.show_grid else 'OFF'}")
         
         elif event.key == 'c':
             # Toggle linha de costa
             self.show_coastline = not self.show_coastline
-            self.update_plot()
+            self.set_layer_visible('coastline', self.show_coastline)
             print(f"Linha de costa: {'ON' if self.show_coastline else 'OFF'}")
         
         elif event.key == 'b':
             # Toggle contornos batimétricos
             self.show_bathy_contours = not self.show_bathy_contours
-            self.update_plot()
+            self.refresh_bathymetry_contours()
             print(f"Contornos batimétricos: {'ON' if self.show_bathy_contours else 'OFF'}")
         
         elif event.key in ['+', '=']:
@@ -549,6 +872,7 @@ class GridEditor:
         
         self.ax.set_xlim(self.current_xlim)
         self.ax.set_ylim(self.current_ylim)
+        self.update_display()
         self.fig.canvas.draw()
     
     def save(self):
@@ -566,7 +890,7 @@ class GridEditor:
         
         print(f"\nSalvando grade modificada em: {output_file}")
         
-        with open(output_file, 'w') as f:
+        with open(output_file, 'w', buffering=1 << 20) as f:
             # Escrever cabeçalho original
             for line in self.header:
                 f.write(line + '\n')
@@ -577,19 +901,23 @@ class GridEditor:
             # Escrever dados
             # A grade original usa formato: i j lon lat depth
             # onde i é índice de longitude e j é índice de latitude
-            for j in range(len(self.lats)):
-                for i in range(len(self.lons)):
-                    i_idx = i + 1  # 1-based
-                    j_idx = j + 1  # 1-based
-                    lon = self.lons[i]
-                    lat = self.lats[j]
-                    depth = self.depth[j, i]
-                    f.write(f"{i_idx:6d} {j_idx:6d} {lon:10.4f} {lat:10.4f} {depth:10.2f}\n")
+            # (i varia mais rápido; índices 1-based). Colunas montadas de
+            # uma vez e formatadas pelo savetxt.
+            nj, ni = self.depth.shape
+            data = np.column_stack([
+                np.tile(np.arange(1, ni + 1), nj),
+                np.repeat(np.arange(1, nj + 1), ni),
+                np.tile(self.lons, nj),
+                np.repeat(self.lats, ni),
+                self.depth.ravel(),
+            ])
+            np.savetxt(f, data, fmt='%6d %6d %10.4f %10.4f %10.2f')
         
         print(f"✓ Grade salva com sucesso!")
         print(f"  Total de pontos: {len(self.lats) * len(self.lons)}")
         self.modified = False
-        self.update_plot()
+        self.update_title()
+        self.refresh_bathymetry_contours()
     
     def show(self):
         """
@@ -611,6 +939,7 @@ Exemplos:
   %(prog)s grade.asc --no-coastline
   %(prog)s grade.asc --no-contours
   %(prog)s grade.asc --no-cartopy
+  %(prog)s grade.asc --cache
         """
     )
     
@@ -619,13 +948,17 @@ Exemplos:
                        help='Não mostrar linha de costa inicialmente')
     parser.add_argument('--no-contours', action='store_true',
                        help='Não mostrar contornos batimétricos')
+    parser.add_argument('--cache', action='store_true',
+                       help='Guardar a grade convertida em .cache/ para abrir '
+                            'mais rápido nas próximas vezes')
     
     args = parser.parse_args()
     
     try:
         editor = GridEditor(
             args.grid_file,
-            show_contours=not args.no_contours
+            show_contours=not args.no_contours,
+            use_cache=args.cache
         )
         
         if args.no_coastline:
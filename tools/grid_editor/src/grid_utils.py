@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Funções Compartilhadas de Grades - RecOM
+========================================
+
+Leitura dos eixos e desenho das células da grade, usados pelo editor
+interativo e pelo visualizador. Depende apenas do NumPy (o desenho recebe
+o eixo Matplotlib/Cartopy já criado).
+
+Autor: RecOM Team
+Data: Dezembro 2025
+"""
+
+import numpy as np
+
+
+def axis_from_indices(indices, coords):
+    """
+    Eixo 1-D e posição de cada ponto nele, a partir da coluna de índices
+    (i ou j) e da coordenada (lon ou lat) de cada linha do arquivo.
+    
+    Índices contíguos são usados diretamente, em O(N) e sem ordenar,
+    qualquer que seja o primeiro índice (1 nas grades do gerador, 0 nas
+    gravadas pelo apply_mask). Com lacunas, o eixo vem dos valores únicos
+    da coordenada.
+    
+    Parameters:
+        indices (array): Índice de cada ponto (inteiros)
+        coords (array): Coordenada de cada ponto
+    
+    Returns:
+        tuple: (eixo, posição de cada ponto no eixo)
+    """
+    positions = indices - indices.min()
+    n = int(positions.max()) + 1
+    
+    if np.count_nonzero(np.bincount(positions, minlength=n)) == n:
+        axis = np.empty(n)
+        axis[positions] = coords
+        return axis, positions
+    
+    return np.unique(coords, return_inverse=True)
+
+
+def plot_cells(ax, lons, lats, data, transform, **kwargs):
+    """
+    Desenha valores por célula da grade.
+    
+    Com espaçamento uniforme usa imshow (uma única imagem, sem montar
+    quadriláteros); caso contrário (ex: longitudes que cruzam ±180°) usa
+    pcolormesh sobre os eixos 1-D.
+    
+    Parameters:
+        ax: Eixo (GeoAxes) de destino
+        lons (array): Array de longitudes (crescente)
+        lats (array): Array de latitudes (crescente)
+        data (array): Valores [nj, ni] (pode ser mascarado)
+        transform: Projeção dos dados
+        **kwargs: cmap, vmin, vmax, zorder etc.
+    
+    Returns:
+        Artista criado (AxesImage ou QuadMesh)
+    """
+    dx = np.diff(lons).mean() if len(lons) > 1 else 0
+    dy = np.diff(lats).mean() if len(lats) > 1 else 0
+    
+    def uniform(coords, step):
+        return len(coords) > 1 and np.abs(np.diff(coords) - step).max() <= 0.01 * step
+    
+    if uniform(lons, dx) and uniform(lats, dy):
+        extent = [lons[0] - dx / 2, lons[-1] + dx / 2,
+                  lats[0] - dy / 2, lats[-1] + dy / 2]
+        return ax.imshow(data, origin='lower', extent=extent,
+                         interpolation='nearest', transform=transform, **kwargs)
+    
+    # (eixos 1-D: a grade é retilínea, sem montar meshgrid; rasterizado para
+    # não gerar um polígono por célula em PDF/SVG)
+    return ax.pcolormesh(lons, lats, data, shading='auto', rasterized=True,
+                         transform=transform, **kwargs)
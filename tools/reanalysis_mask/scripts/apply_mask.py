@@ -21,6 +21,41 @@ import sys
 import os
 from datetime import datetime
 
+# Adicionar diretório src ao path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mask_extractor import nearest_index, write_columns
+
+def read_columns(filename):
+    """
+    Lê um arquivo ASCII de 5 colunas (i j lon lat valor).
+    
+    O cabeçalho ('#') é lido linha a linha só no início do arquivo; os dados
+    são lidos de uma vez pelo parser em C do NumPy, que grava direto no
+    array final. Os índices i, j não são usados (a posição vem de lon/lat)
+    e não são carregados.
+    
+    Returns:
+        header (list): Linhas de cabeçalho
+        data (array): Dados [N, 3] (lon lat valor)
+    """
+    header = []
+    
+    with open(filename, 'r') as f:
+        while True:
+            pos = f.tell()
+            line = f.readline()
+            if line.startswith('#'):
+                header.append(line.strip())
+            elif line and not line.strip():
+                continue
+            else:
+                break
+        f.seek(pos)
+        data = np.loadtxt(f, comments='#', usecols=(2, 3, 4), ndmin=2)
+    
+    return header, data
+
 def load_grid(filename):
     """
     Carrega grade ASCII.
@@ -31,36 +66,64 @@ def load_grid(filename):
         lats (array): Coordenadas latitude
         depth (array): Profundidades [nj, ni]
     """
+    if filename.endswith('.nc'):
+        return load_grid_nc(filename)
+    
     print(f"Carregando grade: {filename}")
     
-    header = []
-    data = []
+    header, data = read_columns(filename)
     
-    with open(filename, 'r') as f:
-        for line in f:
-            if line.startswith('#'):
-                header.append(line.strip())
-            elif line.strip():
-                parts = line.split()
-                if len(parts) >= 5:
-                    i, j, lon, lat, depth = map(float, parts[:5])
-                    data.append([lon, lat, depth])
+    # Reconstruir grade (posição de cada ponto pelos valores de lon/lat)
+    lons, lon_idx = np.unique(data[:, 0], return_inverse=True)
+    lats, lat_idx = np.unique(data[:, 1], return_inverse=True)
     
-    data = np.array(data)
+    depth = np.zeros((len(lats), len(lons)))
+    depth[lat_idx, lon_idx] = data[:, 2]
     
-    # Reconstruir grade
-    lons = np.unique(data[:, 0])
-    lats = np.unique(data[:, 1])
+    print(f"  ✓ Grade: {len(lons)} x {len(lats)} pontos")
+    print(f"    Oceano: {np.count_nonzero(depth > 0)} pontos")
+    print(f"    Terra: {np.count_nonzero(depth == 0)} pontos")
     
-    depth = np.zeros((len(lats), len(lons)))
-    for row in data:
-        lon_idx = np.where(lons == row[0])[0][0]
-        lat_idx = np.where(lats == row[1])[0][0]
-        depth[lat_idx, lon_idx] = row[2]
+    return header, lons, lats, depth
+
+def load_grid_nc(filename):
+    """
+    Carrega grade NetCDF (variável 'depth' [lat, lon], como a gravada pelo
+    gerador de grades GEBCO ou por save_grid_nc).
+    
+    Os eixos são ordenados como na leitura ASCII; os atributos globais
+    viram as linhas de cabeçalho.
+    
+    Returns:
+        header (list): Linhas de cabeçalho
+        lons (array): Coordenadas longitude
+        lats (array): Coordenadas latitude
+        depth (array): Profundidades [nj, ni]
+    """
+    import xarray as xr
+    
+    print(f"Carregando grade NetCDF: {filename}")
+    
+    with xr.open_dataset(filename) as ds:
+        depth_var = ds['depth'].transpose('lat', 'lon')
+        lons = depth_var['lon'].values.astype(np.float64)
+        lats = depth_var['lat'].values.astype(np.float64)
+        depth = depth_var.values.astype(np.float64)
+        header = [f"# {key}: {value}" for key, value in ds.attrs.items()
+                  if key != 'source_header']
+        if 'source_header' in ds.attrs:
+            header = ds.attrs['source_header'].split('\n') + header
+    
+    # Mesma ordem dos eixos da leitura ASCII (ex: grades que cruzam ±180°)
+    lon_order = np.argsort(lons, kind='stable')
+    lat_order = np.argsort(lats, kind='stable')
+    lons = lons[lon_order]
+    lats = lats[lat_order]
+    depth = depth[np.ix_(lat_order, lon_order)]
     
     print(f"  ✓ Grade: {len(lons)} x {len(lats)} pontos")
-    print(f"    Oceano: {np.sum(depth > 0)} pontos")
-    print(f"    Terra: {np.sum(depth == 0)} pontos")
+    print(f"    Oceano: {np.count_nonzero(depth > 0)} pontos")
+    print(f"    Terra: {np.count_nonzero(depth == 0)} pontos")
     
     return header, lons, lats, depth
 
@@ -73,46 +136,71 @@ def load_mask(filename):
         mask_lats (array): Coordenadas latitude
         mask (array): Valores da máscara [nj, ni] (1=oceano, 0=terra)
     """
+    if filename.endswith('.nc'):
+        return load_mask_nc(filename)
+    
     print(f"\nCarregando máscara: {filename}")
     
-    mask_data = []
+    _, mask_data = read_columns(filename)
     
-    with open(filename, 'r') as f:
-        for line in f:
-            if line.startswith('#') or not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 5:
-                i, j, lon, lat, mask_val = map(float, parts[:5])
-                mask_data.append([lon, lat, int(mask_val)])
+    # Reconstruir grade da máscara
+    mask_lons, lon_idx = np.unique(mask_data[:, 0], return_inverse=True)
+    mask_lats, lat_idx = np.unique(mask_data[:, 1], return_inverse=True)
     
-    mask_data = np.array(mask_data)
+    # Valores 0/1 em uint8 (1 byte por ponto em vez de 8 do float64)
+    mask = np.zeros((len(mask_lats), len(mask_lons)), dtype=np.uint8)
+    mask[lat_idx, lon_idx] = mask_data[:, 2].astype(int)
     
-    # Reconstruir grade da máscara
-    mask_lons = np.unique(mask_data[:, 0])
-    mask_lats = np.unique(mask_data[:, 1])
+    print(f"  ✓ Máscara: {len(mask_lons)} x {len(mask_lats)} pontos")
+    print(f"    Oceano: {np.count_nonzero(mask)} pontos")
+    print(f"    Terra: {mask.size - np.count_nonzero(mask)} pontos")
+    
+    return mask_lons, mask_lats, mask
+
+def load_mask_nc(filename):
+    """
+    Carrega máscara NetCDF (variável 'mask' [lat, lon], como a gravada por
+    ReanalysisMaskExtractor.export_mask com extensão '.nc').
+    
+    Returns:
+        mask_lons (array): Coordenadas longitude
+        mask_lats (array): Coordenadas latitude
+        mask (array): Valores da máscara [nj, ni] (1=oceano, 0=terra)
+    """
+    import xarray as xr
     
-    mask = np.zeros((len(mask_lats), len(mask_lons)))
-    for row in mask_data:
-        lon_idx = np.where(mask_lons == row[0])[0][0]
-        lat_idx = np.where(mask_lats == row[1])[0][0]
-        mask[lat_idx, lon_idx] = row[2]
+    print(f"\nCarregando máscara NetCDF: {filename}")
+    
+    with xr.open_dataset(filename) as ds:
+        mask_var = ds['mask'].transpose('lat', 'lon')
+        mask_lons = mask_var['lon'].values.astype(np.float64)
+        mask_lats = mask_var['lat'].values.astype(np.float64)
+        mask = mask_var.values.astype(np.uint8)
+    
+    # Mesma ordem dos eixos da leitura ASCII (coordenadas crescentes)
+    lon_order = np.argsort(mask_lons, kind='stable')
+    lat_order = np.argsort(mask_lats, kind='stable')
+    mask_lons = mask_lons[lon_order]
+    mask_lats = mask_lats[lat_order]
+    mask = mask[np.ix_(lat_order, lon_order)]
     
     print(f"  ✓ Máscara: {len(mask_lons)} x {len(mask_lats)} pontos")
-    print(f"    Oceano: {np.sum(mask == 1)} pontos")
-    print(f"    Terra: {np.sum(mask == 0)} pontos")
+    print(f"    Oceano: {np.count_nonzero(mask)} pontos")
+    print(f"    Terra: {mask.size - np.count_nonzero(mask)} pontos")
     
     return mask_lons, mask_lats, mask
 
 def normalize_longitude(lon):
     """
-    Normaliza longitude para -180 a 180.
+    Normaliza longitude(s) para -180 a 180 (aceita escalar ou array).
+    
+    Desloca por múltiplos de 360° apenas valores fora do intervalo, de modo
+    que -180 e +180 são mantidos.
     """
-    while lon > 180:
-        lon -= 360
-    while lon < -180:
-        lon += 360
-    return lon
+    lon = np.asarray(lon, dtype=float)
+    turns = (np.maximum(np.ceil((lon - 180.0) / 360.0), 0.0)
+             - np.maximum(np.ceil((-180.0 - lon) / 360.0), 0.0))
+    return lon - 360.0 * turns
 
 def apply_mask(lons, lats, depth, mask_lons, mask_lats, mask, preserve_boundaries=False):
     """
@@ -138,7 +226,7 @@ def apply_mask(lons, lats, depth, mask_lons, mask_lats, mask, preserve_boundarie
     mask_lons_norm = mask_lons.copy()
     if np.any(mask_lons > 180):
         print("  Convertendo longitudes da máscara de [0,360] para [-180,180]")
-        mask_lons_norm = np.array([normalize_longitude(lon) for lon in mask_lons])
+        mask_lons_norm = normalize_longitude(mask_lons)
         # Reordenar se necessário
         if not np.all(mask_lons_norm[:-1] <= mask_lons_norm[1:]):
             sort_idx = np.argsort(mask_lons_norm)
@@ -163,16 +251,16 @@ def apply_mask(lons, lats, depth, mask_lons, mask_lats, mask, preserve_boundarie
     preserve_lon_minus180 = False
     
     if preserve_boundaries:
-        # Verificar se grade original tem -180 ou +180 que seriam cortados
-        has_lon_180 = np.any(np.abs(lons - 180.0) < 0.001)
-        has_lon_minus180 = np.any(np.abs(lons + 180.0) < 0.001)
+        # Colunas da grade original em -180 e +180 (índices calculados uma vez)
+        idx_180 = np.flatnonzero(np.abs(lons - 180.0) < 0.001)[:1]
+        idx_minus180 = np.flatnonzero(np.abs(lons + 180.0) < 0.001)[:1]
         
         # Verificar se essas longitudes seriam removidas pelo corte
-        if has_lon_180 and not lon_mask[np.argmin(np.abs(lons - 180.0))]:
+        if idx_180.size and not lon_mask[idx_180[0]]:
             preserve_lon_180 = True
             print("  ℹ Preservando coluna em longitude +180° (fora do domínio da máscara)")
         
-        if has_lon_minus180 and not lon_mask[np.argmin(np.abs(lons + 180.0))]:
+        if idx_minus180.size and not lon_mask[idx_minus180[0]]:
             preserve_lon_minus180 = True
             print("  ℹ Preservando coluna em longitude -180° (fora do domínio da máscara)")
     
@@ -190,53 +278,39 @@ def apply_mask(lons, lats, depth, mask_lons, mask_lats, mask, preserve_boundarie
     print(f"  Grade cortada: {len(lons_cropped)} x {len(lats_cropped)} = {n_cropped} pontos")
     print(f"  Pontos removidos (fora do domínio): {n_removed}")
     
-    # Aplicar máscara
-    depth_masked = depth_cropped.copy()
-    n_changes = 0
-    
-    for j, lat in enumerate(lats_cropped):
-        for i, lon in enumerate(lons_cropped):
-            # Encontrar ponto mais próximo na máscara
-            lon_idx = np.argmin(np.abs(mask_lons_norm - lon))
-            lat_idx = np.argmin(np.abs(mask_lats - lat))
-            
-            mask_val = mask[lat_idx, lon_idx]
-            
-            # Se máscara diz terra (0), zerar profundidade
-            if mask_val == 0 and depth_masked[j, i] > 0:
-                depth_masked[j, i] = 0.0
-                n_changes += 1
+    # Aplicar máscara (a indexação com np.ix_ já devolve uma cópia; a grade
+    # original não é alterada)
+    depth_masked = depth_cropped
+    
+    # Ponto mais próximo na máscara para cada coluna/linha da grade
+    lon_idx = nearest_index(mask_lons_norm, lons_cropped)
+    lat_idx = nearest_index(mask_lats, lats_cropped)
+    mask_vals = mask[np.ix_(lat_idx, lon_idx)]
+    
+    # Se máscara diz terra (0), zerar profundidade
+    to_land = (mask_vals == 0) & (depth_masked > 0)
+    depth_masked[to_land] = 0.0
+    n_changes = int(np.count_nonzero(to_land))
     
     print(f"  ✓ {n_changes} pontos convertidos para terra")
     
     # Adicionar colunas de borda se necessário
     if preserve_lon_minus180 or preserve_lon_180:
-        lons_final = []
-        depth_cols = []
+        # Coluna -180 à esquerda e +180 à direita (vazias se não preservadas),
+        # unidas aos dados principais com um único concatenate
+        left = idx_minus180 if preserve_lon_minus180 else idx_minus180[:0]
+        right = idx_180 if preserve_lon_180 else idx_180[:0]
+        depth_lat = depth[lat_mask]
         
-        # Adicionar coluna -180 se necessário
-        if preserve_lon_minus180:
-            lon_idx_orig = np.argmin(np.abs(lons + 180.0))
-            lons_final.append(-180.0)
-            depth_cols.append(depth[np.ix_(lat_mask, [lon_idx_orig])])
-        
-        # Adicionar dados principais
-        lons_final.extend(lons_cropped)
-        depth_cols.append(depth_masked)
-        
-        # Adicionar coluna +180 se necessário
-        if preserve_lon_180:
-            lon_idx_orig = np.argmin(np.abs(lons - 180.0))
-            lons_final.append(180.0)
-            depth_cols.append(depth[np.ix_(lat_mask, [lon_idx_orig])])
-        
-        lons_cropped = np.array(lons_final)
-        depth_masked = np.concatenate(depth_cols, axis=1)
+        lons_cropped = np.concatenate([np.full(left.size, -180.0), lons_cropped,
+                                       np.full(right.size, 180.0)])
+        depth_masked = np.concatenate([depth_lat[:, left], depth_masked,
+                                       depth_lat[:, right]], axis=1)
         
         print(f"  ✓ Colunas de borda preservadas: {len(lons_cropped)} x {len(lats_cropped)} pontos")
     
-    print(f"  Oceano final: {np.sum(depth_masked > 0)} pontos")
-    print(f"  Terra final: {np.sum(depth_masked == 0)} pontos")
+    print(f"  Oceano final: {np.count_nonzero(depth_masked > 0)} pontos")
+    print(f"  Terra final: {np.count_nonzero(depth_masked == 0)} pontos")
     
     return lons_cropped, lats_cropped, depth_masked, n_changes, n_removed
 
@@ -244,6 +318,9 @@ def save_grid(filename, header, lons, lats, depth, mask_file):
     """
     Salva grade com máscara aplicada.
     """
+    if filename.endswith('.nc'):
+        return save_grid_nc(filename, header, lons, lats, depth, mask_file)
+    
     print(f"\nSalvando grade com máscara aplicada: {filename}")
     
     with open(filename, 'w') as f:
@@ -255,15 +332,46 @@ def save_grid(filename, header, lons, lats, depth, mask_file):
         f.write(f"# Máscara aplicada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
         f.write(f"# Arquivo de máscara: {os.path.basename(mask_file)}\n")
         
-        # Dados da grade
-        idx = 0
-        for j, lat in enumerate(lats):
-            for i, lon in enumerate(lons):
-                f.write(f"{i:6d} {j:6d} {lon:12.6f} {lat:12.6f} {depth[j,i]:12.2f}\n")
-                idx += 1
+        # Dados da grade (i varia mais rápido; índices a partir de 0),
+        # colunas montadas de uma vez e formatadas em blocos
+        nj, ni = depth.shape
+        write_columns(f, [
+            np.tile(np.arange(ni), nj),
+            np.repeat(np.arange(nj), ni),
+            np.tile(lons, nj),
+            np.repeat(lats, ni),
+            depth.ravel(),
+        ], '%6d %6d %12.6f %12.6f %12.2f')
     
     print(f"  ✓ {len(lons) * len(lats)} pontos salvos")
 
+def save_grid_nc(filename, header, lons, lats, depth, mask_file):
+    """
+    Salva grade com máscara aplicada em NetCDF comprimido, em blocos de até
+    256 x 256 pontos. O cabeçalho original fica no atributo 'source_header'.
+    """
+    import xarray as xr
+    
+    print(f"\nSalvando grade com máscara aplicada: {filename}")
+    
+    nj, ni = depth.shape
+    ds = xr.Dataset(
+        {'depth': (('lat', 'lon'), depth.astype(np.float32),
+                   {'units': 'm', 'long_name': 'Profundidade (positiva no oceano)'})},
+        coords={'lon': ('lon', lons,
+                        {'units': 'degrees_east', 'standard_name': 'longitude'}),
+                'lat': ('lat', lats,
+                        {'units': 'degrees_north', 'standard_name': 'latitude'})},
+        attrs={'Conventions': 'CF-1.8',
+               'source_header': '\n'.join(header),
+               'mask_applied': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+               'mask_file': os.path.basename(mask_file)}
+    )
+    ds.to_netcdf(filename, encoding={'depth': {'zlib': True, 'complevel': 1,
+                                               'chunksizes': (min(nj, 256), min(ni, 256))}})
+    
+    print(f"  ✓ {ni * nj} pontos salvos")
+
 def main():
     parser = argparse.ArgumentParser(
         description='Aplica máscara de reanálise a uma grade oceânica',
@@ -283,9 +391,10 @@ Exemplos:
         """
     )
     
-    parser.add_argument('grid_file', help='Arquivo de grade (.asc)')
-    parser.add_argument('mask_file', help='Arquivo de máscara (.asc)')
-    parser.add_argument('--output', '-o', help='Arquivo de saída (padrão: <grid>_masked.asc)')
+    parser.add_argument('grid_file', help='Arquivo de grade (.asc ou .nc)')
+    parser.add_argument('mask_file', help='Arquivo de máscara (.asc ou .nc)')
+    parser.add_argument('--output', '-o',
+                        help='Arquivo de saída, .asc ou .nc (padrão: <grid>_<mascara> no formato da grade)')
     parser.add_argument('--preserve-boundaries', action='store_true',
                        help='Preserva colunas de longitude em -180°/+180° usando dados originais')
     
@@ -304,15 +413,16 @@ Exemplos:
     if args.output:
         output_file = args.output
     else:
-        # Adicionar sufixo '_masked' antes da extensão
-        base = args.grid_file.replace('.asc', '')
+        # Adicionar sufixo '_masked' antes da extensão (mesmo formato da grade)
+        base, ext = os.path.splitext(args.grid_file)
+        ext = '.nc' if ext == '.nc' else '.asc'
         # Extrair nome base da máscara (ex: bran2020 de mask_ocean_bran2020_...)
         mask_base = os.path.basename(args.mask_file)
         if mask_base.startswith('mask_ocean_'):
             mask_name = mask_base.split('_')[2]  # Pega terceiro elemento (ex: bran2020)
         else:
             mask_name = 'masked'
-        output_file = f"{base}_{mask_name}.asc"
+        output_file = f"{base}_{mask_name}{ext}"
     
     print("="*70)
     print(" APLICAR MÁSCARA DE REANÁLISE")
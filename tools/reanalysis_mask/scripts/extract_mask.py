@@ -29,7 +29,7 @@ import argparse
 # Adicionar diretório src ao path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from mask_extractor import ReanalysisMaskExtractor
+from mask_extractor import ReanalysisMaskExtractor, coord_range
 
 
 def main():
@@ -72,11 +72,23 @@ Formatos suportados:
     parser.add_argument('--lat-range', nargs=2, type=float, metavar=('MIN', 'MAX'),
                        help='Limites de latitude (min max)')
     parser.add_argument('--output', '-o', help='Arquivo de saída (auto-gerado se não especificado)')
+    parser.add_argument('--format', choices=['asc', 'nc'], default=None,
+                       help='Formato de saída: asc (texto) ou nc (NetCDF comprimido); '
+                            'padrão: pela extensão de --output, ou asc')
     parser.add_argument('--no-align', action='store_true',
                        help='Não alinhar grade alvo à grade original')
     
     args = parser.parse_args()
     
+    # --format explícito precisa concordar com a extensão de --output: quem lê
+    # a máscara (apply_mask.py, visualize_mask.py) decide o formato por ela
+    if args.format and args.output:
+        output_is_nc = args.output.endswith('.nc')
+        if output_is_nc != (args.format == 'nc'):
+            parser.error(f"--format {args.format} não corresponde à extensão de "
+                         f"--output {args.output} (use .nc para nc e outra "
+                         f"extensão, ex: .asc, para asc)")
+    
     try:
         print("="*70)
         print(" EXTRATOR DE MÁSCARA - REANÁLISES OCEÂNICAS")
@@ -99,15 +111,15 @@ Formatos suportados:
         if args.lon_range or args.lat_range:
             print("\nAplicando recorte espacial...")
             if args.lon_range:
-                lon_mask = (extractor.lons >= args.lon_range[0]) & (extractor.lons <= args.lon_range[1])
-                extractor.lons = extractor.lons[lon_mask]
-                extractor.mask = extractor.mask[:, lon_mask]
+                lon_sel = coord_range(extractor.lons, *args.lon_range)
+                extractor.lons = extractor.lons[lon_sel]
+                extractor.mask = extractor.mask[:, lon_sel]
                 print(f"  Longitude: [{args.lon_range[0]}, {args.lon_range[1]}]")
             
             if args.lat_range:
-                lat_mask = (extractor.lats >= args.lat_range[0]) & (extractor.lats <= args.lat_range[1])
-                extractor.lats = extractor.lats[lat_mask]
-                extractor.mask = extractor.mask[lat_mask, :]
+                lat_sel = coord_range(extractor.lats, *args.lat_range)
+                extractor.lats = extractor.lats[lat_sel]
+                extractor.mask = extractor.mask[lat_sel, :]
                 print(f"  Latitude: [{args.lat_range[0]}, {args.lat_range[1]}]")
         
         # Degradar resolução se especificado
@@ -157,11 +169,12 @@ Formatos suportados:
             else:
                 res_str = "original"
             
-            filename = f"mask_ocean_{base_name}_{lon_range_str}_{lat_range_str}_{res_str}.asc"
+            filename = f"mask_ocean_{base_name}_{lon_range_str}_{lat_range_str}_{res_str}.{args.format or 'asc'}"
             output_file = os.path.join(output_dir, filename)
         
         # Exportar máscara
-        extractor.export_mask(output_file, mask_to_export, lons_to_export, lats_to_export)
+        extractor.export_mask(output_file, mask_to_export, lons_to_export, lats_to_export,
+                              format=args.format)
         
         # Limpeza
         extractor.cleanup()
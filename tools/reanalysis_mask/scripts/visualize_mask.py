@@ -7,51 +7,69 @@ Visualizador de Máscaras Terra/Oceano
 Script para visualizar máscaras extraídas de reanálises.
 
 Uso:
-    python visualize_mask.py <arquivo_mascara.asc>
+    python visualize_mask.py <arquivo_mascara.asc|.nc> [output.png] [--detailed]
 """
 
 import sys
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.colors import ListedColormap
 import cartopy.crs as ccrs
 import cartopy.feature as cfeature
 
 
 def load_mask_file(filename):
-    """Carrega máscara de arquivo ASCII."""
+    """Carrega máscara de arquivo ASCII ou NetCDF (.nc)."""
     print(f"Carregando máscara de: {filename}")
     
-    data = []
-    with open(filename, 'r') as f:
-        for line in f:
-            if line.startswith('#') or not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 5:
-                i, j, lon, lat, mask = map(float, parts[:5])
-                data.append([lon, lat, int(mask)])
+    if filename.endswith('.nc'):
+        return load_mask_netcdf(filename)
     
-    data = np.array(data)
+    # Colunas lon, lat, mask lidas de uma vez pelo parser em C do NumPy
+    # (comentários '#' e linhas vazias são ignorados)
+    data = np.loadtxt(filename, comments='#', usecols=(2, 3, 4), ndmin=2)
     
-    # Reconstruir grade
-    lons = np.unique(data[:, 0])
-    lats = np.unique(data[:, 1])
+    # Reconstruir grade (índices de cada ponto vêm do próprio np.unique)
+    lons, lon_idx = np.unique(data[:, 0], return_inverse=True)
+    lats, lat_idx = np.unique(data[:, 1], return_inverse=True)
     
-    mask = np.zeros((len(lats), len(lons)))
-    for row in data:
-        lon_idx = np.where(lons == row[0])[0][0]
-        lat_idx = np.where(lats == row[1])[0][0]
-        mask[lat_idx, lon_idx] = row[2]
+    # Valores 0/1 em int8 (1 byte por ponto; a conversão trunca como int())
+    mask = np.zeros((len(lats), len(lons)), dtype=np.int8)
+    mask[lat_idx, lon_idx] = data[:, 2]
     
     print(f"✓ Máscara carregada: {len(lons)}x{len(lats)}")
-    print(f"  Oceano: {np.sum(mask==1)} pontos")
-    print(f"  Terra: {np.sum(mask==0)} pontos")
+    print(f"  Oceano: {np.count_nonzero(mask == 1)} pontos")
+    print(f"  Terra: {np.count_nonzero(mask == 0)} pontos")
     
     return lons, lats, mask
 
 
-def plot_mask(lons, lats, mask, output_file=None):
-    """Plota máscara com Cartopy."""
+def load_mask_netcdf(filename):
+    """Carrega máscara NetCDF (variável 'mask' [lat, lon]) sem parsing de texto."""
+    import xarray as xr
+    
+    with xr.open_dataset(filename) as ds:
+        mask_var = ds['mask'].transpose('lat', 'lon').sortby('lon').sortby('lat')
+        lons = mask_var['lon'].values
+        lats = mask_var['lat'].values
+        mask = mask_var.values.astype(np.int8)
+    
+    print(f"✓ Máscara carregada: {len(lons)}x{len(lats)}")
+    print(f"  Oceano: {np.count_nonzero(mask == 1)} pontos")
+    print(f"  Terra: {np.count_nonzero(mask == 0)} pontos")
+    
+    return lons, lats, mask
+
+
+def plot_mask(lons, lats, mask, output_file=None, detailed=False):
+    """
+    Plota máscara com Cartopy.
+    
+    Linha de costa e fronteiras em escala fixa 1:110m (suficiente para
+    máscaras degradadas); detailed=True usa 1:50m. A escala automática do
+    Cartopy chegava a 1:10m em domínios regionais, dominando o tempo de
+    desenho.
+    """
     print("\nGerando visualização...")
     
     proj = ccrs.PlateCarree()
@@ -60,24 +78,17 @@ def plot_mask(lons, lats, mask, output_file=None):
     # Definir extensão
     ax.set_extent([lons.min(), lons.max(), lats.min(), lats.max()], crs=proj)
     
-    # Plotar máscara
-    lon_mesh, lat_mesh = np.meshgrid(lons, lats)
-    
-    # Terra em cinza
-    land_mask = np.ma.masked_where(mask != 0, mask)
-    ax.pcolormesh(lon_mesh, lat_mesh, land_mask,
-                 cmap='Greys', vmin=0, vmax=1,
-                 shading='auto', transform=proj, alpha=0.5)
-    
-    # Oceano em azul
-    ocean_mask = np.ma.masked_where(mask != 1, mask)
-    ax.pcolormesh(lon_mesh, lat_mesh, ocean_mask,
-                 cmap='Blues', vmin=0, vmax=2,
-                 shading='auto', transform=proj)
+    # Plotar máscara: terra (0) e oceano (1) em uma única malha com mapa de
+    # cores discreto, sobre os eixos 1-D (sem meshgrid) e rasterizada (sem
+    # um polígono por célula em PDF/SVG)
+    cmap = ListedColormap([(1.0, 1.0, 1.0, 0.5), plt.cm.Blues(0.5)])
+    ax.pcolormesh(lons, lats, mask, cmap=cmap, vmin=0, vmax=1,
+                  shading='auto', rasterized=True, transform=proj)
     
     # Adicionar features
-    ax.add_feature(cfeature.COASTLINE, edgecolor='red', linewidth=2, zorder=5)
-    ax.add_feature(cfeature.BORDERS, linestyle=':', edgecolor='gray', zorder=5)
+    scale = '50m' if detailed else '110m'
+    ax.add_feature(cfeature.COASTLINE.with_scale(scale), edgecolor='red', linewidth=2, zorder=5)
+    ax.add_feature(cfeature.BORDERS.with_scale(scale), linestyle=':', edgecolor='gray', zorder=5)
     
     # Grid
     gl = ax.gridlines(draw_labels=True, alpha=0.3, linestyle='--', linewidth=0.5)
@@ -101,16 +112,19 @@ def plot_mask(lons, lats, mask, output_file=None):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Uso: python visualize_mask.py <arquivo_mascara.asc> [output.png]")
+    detailed = '--detailed' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--detailed']
+    
+    if len(args) < 1:
+        print("Uso: python visualize_mask.py <arquivo_mascara.asc|.nc> [output.png] [--detailed]")
         return 1
     
-    mask_file = sys.argv[1]
-    output_file = sys.argv[2] if len(sys.argv) > 2 else None
+    mask_file = args[0]
+    output_file = args[1] if len(args) > 1 else None
     
     try:
         lons, lats, mask = load_mask_file(mask_file)
-        plot_mask(lons, lats, mask, output_file)
+        plot_mask(lons, lats, mask, output_file, detailed=detailed)
         print("\n✓ Concluído!")
         return 0
     except Exception as e:
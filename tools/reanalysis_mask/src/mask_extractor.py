@@ -19,6 +19,69 @@ import os
 from datetime import datetime
 
 
+def nearest_index(coords, values):
+    """
+    Índice do ponto mais próximo em coords para cada valor de values.
+    
+    Equivale a np.argmin(np.abs(coords - v)) para cada v (em empate, o menor
+    índice), mas vetorizado: busca binária quando coords está ordenado.
+    """
+    coords = np.asarray(coords)
+    values = np.asarray(values)
+    
+    if len(coords) < 2 or not np.all(coords[:-1] < coords[1:]):
+        # Coordenadas não ordenadas: comparação completa
+        return np.abs(coords[np.newaxis, :] - values[:, np.newaxis]).argmin(axis=1)
+    
+    right = np.clip(np.searchsorted(coords, values), 1, len(coords) - 1)
+    left = right - 1
+    use_right = np.abs(coords[right] - values) < np.abs(coords[left] - values)
+    return np.where(use_right, right, left)
+
+
+def coord_range(coords, vmin, vmax):
+    """
+    Índices de coords dentro de [vmin, vmax].
+    
+    Com coordenadas crescentes devolve um slice (as extremidades vêm de
+    np.searchsorted e a indexação gera uma view, sem cópia); caso contrário,
+    uma máscara booleana.
+    """
+    coords = np.asarray(coords)
+    
+    if len(coords) < 2 or np.all(coords[:-1] < coords[1:]):
+        start = np.searchsorted(coords, vmin, side='left')
+        stop = np.searchsorted(coords, vmax, side='right')
+        return slice(int(start), int(stop))
+    
+    return (coords >= vmin) & (coords <= vmax)
+
+
+def write_columns(f, columns, fmt, chunk_rows=65536):
+    """
+    Escreve colunas de dados como linhas de texto de largura fixa.
+    
+    Cada bloco de linhas é formatado por um único operador % sobre o
+    formato repetido e gravado com uma única escrita (np.savetxt formata e
+    escreve uma linha por vez).
+    
+    Parameters:
+        f: Arquivo de texto aberto para escrita (ou buffer com write())
+        columns (list): Arrays 1-D de mesmo comprimento, um por coluna
+        fmt (str): Formato de uma linha, sem '\n'
+        chunk_rows (int): Linhas por bloco (limita a memória temporária)
+    """
+    n_rows = len(columns[0])
+    line = fmt + '\n'
+    
+    for start in range(0, n_rows, chunk_rows):
+        stop = min(start + chunk_rows, n_rows)
+        block = np.empty((stop - start, len(columns)), dtype=object)
+        for k, column in enumerate(columns):
+            block[:, k] = column[start:stop]
+        f.write((line * (stop - start)) % tuple(block.ravel().tolist()))
+
+
 class ReanalysisMaskExtractor:
     """
     Extrator de máscaras terra/oceano de reanálises oceânicas.
@@ -56,8 +119,9 @@ class ReanalysisMaskExtractor:
         if not os.path.exists(self.reanalysis_file):
             raise FileNotFoundError(f"Arquivo não encontrado: {self.reanalysis_file}")
         
-        # Carregar dataset
-        self.dataset = xr.open_dataset(self.reanalysis_file)
+        # Carregar dataset (leitura preguiçosa; cache=False evita manter em
+        # memória uma cópia de cada variável lida além do array retornado)
+        self.dataset = xr.open_dataset(self.reanalysis_file, cache=False)
         
         print(f"✓ Dataset carregado")
         print(f"  Dimensões: {dict(self.dataset.sizes)}")
@@ -161,16 +225,33 @@ class ReanalysisMaskExtractor:
                     print(f"  Usando superfície (dim='{dim}')")
                     break
             
-            # Carregar dados
+            # Qualquer outra dimensão além de lon/lat (ex: nível vertical com
+            # outro nome): usar o primeiro índice, para ler do disco só uma
+            # fatia 2-D e nunca o cubo inteiro
+            spatial_dims = set(self.dataset[self.lon_name].dims) | set(self.dataset[self.lat_name].dims)
+            extra_dims = [dim for dim in var_data.dims if dim not in spatial_dims]
+            if extra_dims:
+                var_data = var_data.isel({dim: 0 for dim in extra_dims})
+                print(f"  ⚠ Usando índice 0 das dimensões {extra_dims}")
+            
+            if var_data.ndim != 2:
+                raise ValueError(f"Variável não é 2-D após a seleção: dims={var_data.dims}")
+            
+            # Carregar dados (apenas a fatia 2-D selecionada)
             data_array = var_data.values
             
             # Criar máscara: 1 = oceano (dados válidos), 0 = terra (NaN/masked)
-            self.mask = np.where(np.isfinite(data_array), 1, 0).astype(np.int8)
+            # (bool -> int8 direto, sem o int64 intermediário de np.where)
+            self.mask = np.isfinite(data_array).astype(np.int8)
+            
+            # A fatia lida só serve para a máscara: liberá-la já (o dataset
+            # continua aberto; fechá-lo cabe a quem chamou, via cleanup())
+            del data_array, var_data
             
-            # Estatísticas
-            n_ocean = np.sum(self.mask == 1)
-            n_land = np.sum(self.mask == 0)
+            # Estatísticas (máscara só tem 0/1)
             total = self.mask.size
+            n_ocean = np.count_nonzero(self.mask)
+            n_land = total - n_ocean
             
             print(f"\n✓ Máscara extraída:")
             print(f"  Dimensões: {self.mask.shape}")
@@ -223,38 +304,42 @@ class ReanalysisMaskExtractor:
             lat_min = self.lats.min()
             lat_max = self.lats.max()
         
-        coarsened_lons = np.arange(lon_min, lon_max + target_resolution_lon, target_resolution_lon)
-        coarsened_lats = np.arange(lat_min, lat_max + target_resolution_lat, target_resolution_lat)
-        
-        # Criar máscara degradada
-        n_lons_coarse = len(coarsened_lons)
-        n_lats_coarse = len(coarsened_lats)
-        coarsened_mask = np.zeros((len(coarsened_lats), len(coarsened_lons)), dtype=np.int8)
-        
-        # Agregar por blocos
-        for i, lon in enumerate(coarsened_lons):
-            for j, lat in enumerate(coarsened_lats):
-                # Encontrar índices na grade fina
-                lon_idx_start = np.argmin(np.abs(self.lons - lon))
-                lat_idx_start = np.argmin(np.abs(self.lats - lat))
-                
-                lon_idx_end = min(lon_idx_start + factor_lon, len(self.lons))
-                lat_idx_end = min(lat_idx_start + factor_lat, len(self.lats))
-                
-                # Extrair bloco da máscara fina
-                block = self.mask[lat_idx_start:lat_idx_end, lon_idx_start:lon_idx_end]
-                
-                if block.size > 0:
-                    # Calcular fração de pontos oceânicos
-                    ocean_fraction = np.sum(block == 1) / block.size
-                    
-                    # Aplicar threshold
-                    coarsened_mask[j, i] = 1 if ocean_fraction >= threshold else 0
+        # Número de pontos pela contagem exata de passos (arange com
+        # max + passo podia gerar pontos extras por arredondamento); um
+        # último ponto cobre a sobra quando a extensão não é múltipla do passo
+        n_lons = int(np.ceil((lon_max - lon_min) / target_resolution_lon - 1e-6)) + 1
+        n_lats = int(np.ceil((lat_max - lat_min) / target_resolution_lat - 1e-6)) + 1
+        coarsened_lons = lon_min + target_resolution_lon * np.arange(n_lons)
+        coarsened_lats = lat_min + target_resolution_lat * np.arange(n_lats)
+        
+        # Início de cada bloco: ponto da grade fina mais próximo de cada ponto
+        # da grade alvo (blocos de factor pontos, truncados na borda)
+        lon_start = nearest_index(self.lons, coarsened_lons)
+        lat_start = nearest_index(self.lats, coarsened_lats)
+        lon_end = np.minimum(lon_start + factor_lon, len(self.lons))
+        lat_end = np.minimum(lat_start + factor_lat, len(self.lats))
+        
+        # Pontos oceânicos por bloco via tabela de somas acumuladas 2-D
+        # (uma passada sobre a máscara fina, sem laço por célula; a máscara
+        # só tem 0/1, então a soma direta já conta os pontos oceânicos)
+        ocean_sum = np.zeros((len(self.lats) + 1, len(self.lons) + 1), dtype=np.int64)
+        np.cumsum(np.cumsum(self.mask, axis=0, dtype=np.int64), axis=1, out=ocean_sum[1:, 1:])
+        
+        block_ocean = (ocean_sum[np.ix_(lat_end, lon_end)]
+                       - ocean_sum[np.ix_(lat_start, lon_end)]
+                       - ocean_sum[np.ix_(lat_end, lon_start)]
+                       + ocean_sum[np.ix_(lat_start, lon_start)])
+        block_size = np.outer(lat_end - lat_start, lon_end - lon_start)
+        
+        # Aplicar threshold à fração de pontos oceânicos (blocos vazios = terra)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ocean_fraction = block_ocean / block_size
+        coarsened_mask = ((block_size > 0) & (ocean_fraction >= threshold)).astype(np.int8)
         
         # Estatísticas
-        n_ocean = np.sum(coarsened_mask == 1)
-        n_land = np.sum(coarsened_mask == 0)
         total = coarsened_mask.size
+        n_ocean = np.count_nonzero(coarsened_mask)
+        n_land = total - n_ocean
         
         print(f"\n✓ Máscara degradada:")
         print(f"  Dimensões: {coarsened_mask.shape}")
@@ -263,15 +348,20 @@ class ReanalysisMaskExtractor:
         
         return coarsened_mask, coarsened_lons, coarsened_lats
     
-    def export_mask(self, output_file, mask=None, lons=None, lats=None):
+    def export_mask(self, output_file, mask=None, lons=None, lats=None, format=None):
         """
-        Exporta máscara para arquivo ASCII (formato compatível com grid editor).
+        Exporta máscara para arquivo ASCII (formato compatível com grid editor)
+        ou para NetCDF comprimido (bem menor e lido diretamente por
+        apply_mask.py e visualize_mask.py, sem reinterpretar texto).
         
         Parameters:
-            output_file (str): Caminho para arquivo de saída
+            output_file (str ou file-like): Caminho para arquivo de saída, ou
+                objeto com método write() (ex: io.StringIO) para escrita em memória
             mask (np.array): Máscara a exportar (None = usar self.mask)
             lons (np.array): Longitudes (None = usar self.lons)
             lats (np.array): Latitudes (None = usar self.lats)
+            format (str): 'asc' ou 'nc' (None = pela extensão de output_file;
+                buffers em memória são sempre ASCII)
         """
         if mask is None:
             mask = self.mask
@@ -280,31 +370,89 @@ class ReanalysisMaskExtractor:
         if lats is None:
             lats = self.lats
         
+        # Destino em memória: escrever diretamente, sem passar pelo disco
+        if hasattr(output_file, 'write'):
+            print("\nExportando máscara para buffer em memória")
+            self._write_mask(output_file, mask, lons, lats)
+            print(f"✓ Máscara exportada:")
+            print(f"  Total de pontos: {len(lons) * len(lats)}")
+            return
+        
         print(f"\nExportando máscara para: {output_file}")
         
-        with open(output_file, 'w') as f:
-            # Cabeçalho
-            f.write(f"# Máscara terra/oceano extraída de reanálise\n")
-            f.write(f"# Gerada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"# Fonte: {os.path.basename(self.reanalysis_file)}\n")
-            f.write(f"# Variável: {self.variable_name}\n")
-            f.write(f"# Formato: i j lon lat mask (1=oceano, 0=terra)\n")
-            f.write(f"#\n")
-            
-            # Dados
-            for j, lat in enumerate(lats):
-                for i, lon in enumerate(lons):
-                    i_idx = i + 1
-                    j_idx = j + 1
-                    mask_val = mask[j, i]
-                    f.write(f"{i_idx:6d} {j_idx:6d} {lon:10.4f} {lat:10.4f} {mask_val:6d}\n")
+        if format is None:
+            format = 'nc' if str(output_file).endswith('.nc') else 'asc'
+        
+        if format == 'nc':
+            self._write_mask_nc(output_file, mask, lons, lats)
+        else:
+            with open(output_file, 'w') as f:
+                self._write_mask(f, mask, lons, lats)
         
         print(f"✓ Máscara exportada:")
         print(f"  Total de pontos: {len(lons) * len(lats)}")
         print(f"  Tamanho: {os.path.getsize(output_file) / 1024:.1f} KB")
     
+    def export_mask_netcdf(self, output_file, mask=None, lons=None, lats=None):
+        """
+        Exporta máscara para NetCDF (atalho para export_mask com format='nc').
+        
+        Parameters:
+            output_file (str): Caminho para arquivo de saída
+            mask (np.array): Máscara a exportar (None = usar self.mask)
+            lons (np.array): Longitudes (None = usar self.lons)
+            lats (np.array): Latitudes (None = usar self.lats)
+        """
+        self.export_mask(output_file, mask, lons, lats, format='nc')
+    
+    def _write_mask(self, f, mask, lons, lats):
+        """Escreve cabeçalho e dados da máscara em um arquivo já aberto."""
+        # Cabeçalho
+        f.write(f"# Máscara terra/oceano extraída de reanálise\n")
+        f.write(f"# Gerada em: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        f.write(f"# Fonte: {os.path.basename(self.reanalysis_file)}\n")
+        f.write(f"# Variável: {self.variable_name}\n")
+        f.write(f"# Formato: i j lon lat mask (1=oceano, 0=terra)\n")
+        f.write(f"#\n")
+        
+        # Dados: colunas montadas de uma vez e escritas em blocos formatados
+        # (ordem: j externo, i interno; índices a partir de 1)
+        ni, nj = len(lons), len(lats)
+        columns = [
+            np.tile(np.arange(1, ni + 1), nj),
+            np.repeat(np.arange(1, nj + 1), ni),
+            np.tile(lons, nj),
+            np.repeat(lats, ni),
+            np.asarray(mask).ravel(),
+        ]
+        write_columns(f, columns, '%6d %6d %10.4f %10.4f %6d')
+    
+    def _write_mask_nc(self, output_file, mask, lons, lats):
+        """
+        Grava a máscara como variável 'mask' [lat, lon] em NetCDF, comprimida
+        em blocos de até 256 x 256 pontos.
+        """
+        mask = np.asarray(mask)
+        nj, ni = mask.shape
+        ds = xr.Dataset(
+            {'mask': (('lat', 'lon'), mask.astype(np.uint8),
+                      {'long_name': 'Máscara terra/oceano (1=oceano, 0=terra)'})},
+            coords={'lon': ('lon', np.asarray(lons),
+                            {'units': 'degrees_east', 'standard_name': 'longitude'}),
+                    'lat': ('lat', np.asarray(lats),
+                            {'units': 'degrees_north', 'standard_name': 'latitude'})},
+            attrs={'Conventions': 'CF-1.8',
+                   'title': 'Máscara terra/oceano extraída de reanálise',
+                   'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                   'source': os.path.basename(self.reanalysis_file),
+                   'variable': str(self.variable_name)}
+        )
+        ds.to_netcdf(output_file, encoding={'mask': {'zlib': True, 'complevel': 4,
+                                                     'chunksizes': (min(nj, 256), min(ni, 256))}})
+    
     def cleanup(self):
         """Fecha dataset e libera memória."""
         if self.dataset is not None:
             self.dataset.close()
+            self.dataset = None
             print("\nDataset fechado.")